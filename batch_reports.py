@@ -0,0 +1,177 @@
+"""Пакетное формирование отчетов без графического интерфейса.
+
+Загружает данные только для чтения (ReadOnlyJSONService: каталог данных не
+меняется, поврежденный файл — ошибка), считает отчеты теми же viewmodel, что
+и окно приложения, и записывает для каждого отчета PNG и CSV / JSON. Tk не
+импортируется — подходит для ночных отчетов на сервере без дисплея.
+
+Пример: python batch_reports.py --data-dir data --out reports/nightly --jobs 3
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from service.json_service import ReadOnlyJSONService
+from view.report_charts import render_report
+from viewmodel.hotel_viewmodel import HotelViewModel
+from viewmodel.reports import HOTELS_REPORT, ROOMS_REPORT, PRICING_REPORT, AnalyticsCache, take_snapshot
+from viewmodel.room_viewmodel import RoomViewModel
+
+REPORTS = (HOTELS_REPORT, ROOMS_REPORT, PRICING_REPORT)
+FORMATS = ("png", "csv", "json")
+DATA_FILES = ("hotels.json", "rooms.json")
+
+
+def _json_safe(value):
+    """NaN (нет доступных номеров в группе) записывается как null"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(item) for item in value]
+    return value
+
+
+def report_rows(report: str, data: Dict) -> Tuple[List[str], List[list]]:
+    """Табличное представление отчета для CSV: заголовок и строки"""
+    if report == HOTELS_REPORT:
+        rows = [["city", city, count] for city, count in data["cities"].items()]
+        rows += [["stars", stars, count] for stars, count in data["stars"].items()]
+        return ["group", "value", "hotels"], rows
+    if report == ROOMS_REPORT:
+        rows = [["room_type", room_type, count] for room_type, count in data["types"].items()]
+        rows += [["availability", label, count] for label, count in data["availability"].items()]
+        return ["group", "value", "rooms"], rows
+
+    percentiles = sorted(data["by_type"]["percentiles"])
+    header = ["group", "value", "rooms", "min", "avg", "max", "available_avg"] + [f"p{q}" for q in percentiles]
+    rows = []
+    for group in ("by_type", "by_city", "by_stars"):
+        stats = data[group]
+        for i, label in enumerate(stats["labels"]):
+            rows.append([group[3:], label, stats["count"][i], stats["min"][i], stats["avg"][i],
+                         stats["max"][i], stats["available_avg"][i]] +
+                        [stats["percentiles"][q][i] for q in percentiles])
+    edges, counts = data["histogram"]["edges"], data["histogram"]["counts"]
+    for low, high, count in zip(edges, edges[1:], counts):
+        rows.append(["histogram", f"{low:.0f}–{high:.0f}", count] + [""] * (len(header) - 3))
+    return header, [["" if isinstance(cell, float) and math.isnan(cell) else cell for cell in row]
+                    for row in rows]
+
+
+def write_report(report: str, data: Dict, out_dir: str, formats: Tuple[str, ...]) -> List[str]:
+    """Запись одного отчета во все форматы; возвращает пути записанных файлов.
+
+    Выполняется и в дочерних процессах, поэтому принимает только сериализуемые аргументы.
+    """
+    out = Path(out_dir)
+    written = []
+    if "png" in formats:
+        path = out / f"{report}.png"
+        path.write_bytes(render_report(report, data))
+        written.append(str(path))
+    if "json" in formats:
+        path = out / f"{report}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(_json_safe(data), f, ensure_ascii=False, indent=2, allow_nan=False)
+        written.append(str(path))
+    if "csv" in formats:
+        path = out / f"{report}.csv"
+        header, rows = report_rows(report, data)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        written.append(str(path))
+    return written
+
+
+def _attempt(func, *args):
+    """Результат вызова и ошибка (одно из двух — None)"""
+    try:
+        return func(*args), None
+    except Exception as e:
+        return None, e
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетное формирование отчетов без графического интерфейса")
+    parser.add_argument("--data-dir", default="data", help="каталог с hotels.json и rooms.json")
+    parser.add_argument("--out", default="reports", help="каталог для готовых отчетов")
+    parser.add_argument("--reports", nargs="+", choices=REPORTS, default=list(REPORTS),
+                        help="какие отчеты формировать")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS),
+                        help="форматы вывода")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="число процессов для отрисовки и записи отчетов (1 — в текущем процессе)")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs должно быть не меньше 1")
+
+    data_dir = Path(args.data_dir)
+    missing = [name for name in DATA_FILES if not (data_dir / name).is_file()]
+    if missing:
+        print(f"В каталоге {args.data_dir} нет файлов данных: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    # Данные в журнале или базе новее JSON файлов — отчет по ним был бы устаревшим
+    storage_files = [data_dir / f"{name}.journal" for name in DATA_FILES] + [data_dir / "hotels.db"]
+    other_storage = [path.name for path in storage_files if path.is_file() and path.stat().st_size]
+    if other_storage:
+        print(f"В каталоге {args.data_dir} есть данные хранилища journal / sqlite ({', '.join(other_storage)}): "
+              f"JSON файлы могут быть устаревшими, отчеты не сформированы", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    json_service = ReadOnlyJSONService(args.data_dir)
+    try:
+        hotel_vm = HotelViewModel(json_service)
+        room_vm = RoomViewModel(hotel_vm, json_service)
+    except Exception as e:
+        print(f"Не удалось загрузить данные из {args.data_dir}: {e}", file=sys.stderr)
+        return 2
+    finally:
+        json_service.close()
+    print(f"Загружено отелей: {hotel_vm.stats.total}, номеров: {room_vm.stats.total} "
+          f"({time.perf_counter() - start:.2f} с)")
+
+    # Данные отчетов считаются здесь (массивы аналитики общие), отрисовка и запись — параллельно
+    analytics = AnalyticsCache()
+    results, outcomes = {}, []
+    for report in args.reports:
+        data, error = _attempt(lambda: take_snapshot(report, hotel_vm, room_vm, analytics)())
+        if error is not None:
+            outcomes.append((report, None, error))
+        else:
+            results[report] = data
+    Path(args.out).mkdir(parents=True, exist_ok=True)
+    formats = tuple(args.formats)
+
+    if args.jobs == 1 or len(results) <= 1:
+        outcomes += [(report, *_attempt(write_report, report, data, args.out, formats))
+                     for report, data in results.items()]
+    else:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(results))) as pool:
+            futures = {report: pool.submit(write_report, report, data, args.out, formats)
+                       for report, data in results.items()}
+            outcomes += [(report, *_attempt(future.result)) for report, future in futures.items()]
+
+    failed = 0
+    for report, written, error in outcomes:
+        if error is not None:
+            failed += 1
+            print(f"Ошибка при формировании отчета {report}: {error}", file=sys.stderr)
+        else:
+            print(f"{report}: {', '.join(written)}")
+    print(f"Готово за {time.perf_counter() - start:.2f} с")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
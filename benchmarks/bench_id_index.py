@@ -0,0 +1,38 @@
+"""Сравнение поиска номера по ID: линейный проход против индекса в RoomViewModel.
+
+Запуск: python -m benchmarks.bench_id_index
+"""
+import random
+
+from benchmarks.common import InMemoryService, make_hotels, make_rooms, timeit
+from viewmodel.hotel_viewmodel import HotelViewModel
+from viewmodel.room_viewmodel import RoomViewModel
+
+SIZES = [10_000, 100_000, 1_000_000]
+LOOKUPS = 200
+
+
+def linear_find(rooms, room_id):
+    """Поиск номера так, как он выполнялся до появления индекса"""
+    for room in rooms:
+        if room.id == room_id:
+            return room
+    raise ValueError(f"Номер с ID {room_id} не найден.")
+
+
+def main():
+    print(f"{'номеров':>10} {'линейно, мкс':>14} {'индекс, мкс':>12} {'ускорение':>10}")
+    for size in SIZES:
+        hotels = make_hotels(max(size // 100, 1))
+        service = InMemoryService(hotels, make_rooms(size, len(hotels)))
+        hotel_vm = HotelViewModel(service)
+        room_vm = RoomViewModel(hotel_vm, service)
+
+        ids = random.Random(size).sample(range(1, size + 1), LOOKUPS)
+        linear = timeit(lambda: [linear_find(room_vm.rooms, i) for i in ids]) / LOOKUPS
+        indexed = timeit(lambda: [room_vm.get_room_by_id(i) for i in ids], repeat=100) / LOOKUPS
+        print(f"{size:>10} {linear * 1e6:>14.1f} {indexed * 1e6:>12.3f} {linear / indexed:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Задержка одного редактирования: перезапись JSON целиком против журнала изменений.
+
+Запуск: python -m benchmarks.bench_journal
+"""
+import tempfile
+
+from benchmarks.common import make_hotels, make_rooms, timeit
+from service.journal_service import JournalJSONService
+from service.json_service import JSONService
+from viewmodel.hotel_viewmodel import HotelViewModel
+from viewmodel.room_viewmodel import RoomViewModel
+
+SIZES = [10_000, 100_000]
+FULL_EDITS = 5
+JOURNAL_EDITS = 500
+
+
+def edit_latency(service, edits: int) -> float:
+    """Среднее время update_room вместе с сохранением"""
+    hotel_vm = HotelViewModel(service)
+    room_vm = RoomViewModel(hotel_vm, service)
+    rooms = room_vm.rooms[:edits]
+
+    def run():
+        for room in rooms:
+            room_vm.update_room(room.id, room.hotel_id, room.room_number, room.room_type,
+                                room.price_per_night + 100, not room.is_available)
+
+    return timeit(run) / edits
+
+
+def main():
+    print(f"{'номеров':>10} {'JSON, мс':>10} {'журнал, мс':>11} {'со сверткой, мс':>16}")
+    for size in SIZES:
+        hotels = make_hotels(max(size // 100, 1))
+        rooms = make_rooms(size, len(hotels))
+        results = []
+        for service_class, kwargs, edits in [
+            (JSONService, {}, FULL_EDITS),
+            (JournalJSONService, {"compact_every": JOURNAL_EDITS * 10}, JOURNAL_EDITS),
+            (JournalJSONService, {"compact_every": 100}, JOURNAL_EDITS),
+        ]:
+            with tempfile.TemporaryDirectory() as data_dir:
+                seed = JSONService(data_dir)
+                seed.save_data("hotels.json", hotels)
+                seed.save_data("rooms.json", rooms)
+                results.append(edit_latency(service_class(data_dir, **kwargs), edits))
+        print(f"{size:>10} {results[0] * 1e3:>10.2f} {results[1] * 1e3:>11.3f} {results[2] * 1e3:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
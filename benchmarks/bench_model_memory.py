@@ -0,0 +1,54 @@
+"""Память под 1M номеров: класс с __dict__ против Room с __slots__ и интернированием типов.
+
+Запуск: python -m benchmarks.bench_model_memory
+"""
+import random
+import tracemalloc
+
+from benchmarks.common import ROOM_TYPES
+from model.room import Room
+
+COUNT = 1_000_000
+
+
+class DictRoom:
+    """Прежнее представление номера: атрибуты в __dict__ экземпляра"""
+
+    def __init__(self, id, hotel_id, room_number, room_type, price_per_night, is_available=True):
+        self.id = id
+        self.hotel_id = hotel_id
+        self.room_number = room_number
+        self.room_type = room_type
+        self.price_per_night = price_per_night
+        self.is_available = is_available
+
+
+def measure(room_class) -> float:
+    """Объем памяти под список номеров в МБ.
+
+    Тип номера собирается заново для каждой записи, как после разбора JSON.
+    """
+    rnd = random.Random(0)
+    tracemalloc.start()
+    rooms = [
+        room_class(i, i % 10_000 + 1, str(100 + i // 10_000), "".join(rnd.choice(ROOM_TYPES)),
+                   float(rnd.randrange(2000, 30000, 500)), rnd.random() < 0.7)
+        for i in range(1, COUNT + 1)
+    ]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rooms
+    return current / 2 ** 20
+
+
+def main():
+    before = measure(DictRoom)
+    after = measure(Room)
+    print(f"{'представление':>20} {'МБ на 1M номеров':>18}")
+    print(f"{'__dict__':>20} {before:>18.0f}")
+    print(f"{'__slots__ + intern':>20} {after:>18.0f}")
+    print(f"экономия: {1 - after / before:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Сравнение выборки номеров по диапазону цен: проход с сортировкой против ценового индекса.
+
+Запуск: python -m benchmarks.bench_price_index
+"""
+import time
+
+from benchmarks.common import InMemoryService, make_hotels, make_rooms, timeit
+from viewmodel.hotel_viewmodel import HotelViewModel
+from viewmodel.room_viewmodel import RoomViewModel
+
+ROOMS = 1_000_000
+HOTELS = 10_000
+QUERIES = [
+    ("доступные в Москве, 5000–8000, 50 дешевых",
+     dict(min_price=5000, max_price=8000, city="Москва", is_available=True, limit=50)),
+    ("все 10000–12000, 20 самых дорогих",
+     dict(min_price=10000, max_price=12000, limit=20, descending=True)),
+    ("отель 42, все по цене", dict(hotel_id=42)),
+    ("доступные «Люкс» до 3000", dict(max_price=3000, is_available=True, room_type="Люкс")),
+]
+
+
+def linear_find(room_vm, hotel_vm, min_price=None, max_price=None, hotel_id=None, city=None,
+                is_available=None, room_type=None, limit=None, descending=False):
+    """Выборка так, как ее пришлось бы делать без индекса: проход и сортировка"""
+    rooms = [
+        room for room in room_vm.rooms
+        if (min_price is None or room.price_per_night >= min_price)
+        and (max_price is None or room.price_per_night <= max_price)
+        and (hotel_id is None or room.hotel_id == hotel_id)
+        and (city is None or hotel_vm.get_hotel_by_id(room.hotel_id).city == city)
+        and (is_available is None or room.is_available == is_available)
+        and (room_type is None or room.room_type == room_type)
+    ]
+    rooms.sort(key=lambda room: (room.price_per_night, room.id), reverse=descending)
+    return rooms[:limit]
+
+
+def main():
+    hotels = make_hotels(HOTELS)
+    service = InMemoryService(hotels, make_rooms(ROOMS, HOTELS))
+    hotel_vm = HotelViewModel(service)
+    room_vm = RoomViewModel(hotel_vm, service)
+
+    start = time.perf_counter()
+    room_vm.find_rooms(limit=1)
+    print(f"Построение ценового индекса для {ROOMS} номеров: {time.perf_counter() - start:.2f} с\n")
+
+    print(f"{'запрос':<44} {'проход, мс':>11} {'индекс, мс':>11}")
+    for title, query in QUERIES:
+        assert room_vm.find_rooms(**query) == linear_find(room_vm, hotel_vm, **query)
+        linear = timeit(lambda: linear_find(room_vm, hotel_vm, **query))
+        indexed = timeit(lambda: room_vm.find_rooms(**query), repeat=5)
+        print(f"{title:<44} {linear * 1e3:>11.1f} {indexed * 1e3:>11.2f}")
+
+    ids = [room.id for room in room_vm.rooms]
+    by_key = timeit(lambda: sorted(ids, key=lambda i: (room_vm.get_room_by_id(i).price_per_night, i)))
+    by_index = timeit(lambda: room_vm.sort_rooms(ids, "price_per_night"))
+    print(f"\nСортировка {len(ids)} строк по цене: sorted {by_key * 1e3:.0f} мс, индекс {by_index * 1e3:.0f} мс")
+
+
+if __name__ == "__main__":
+    main()
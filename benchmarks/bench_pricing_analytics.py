@@ -0,0 +1,63 @@
+"""Анализ цен по типам номеров: циклы Python против векторной аналитики NumPy.
+
+Массивы строятся полностью один раз, после правок они обновляются по
+изменившимся номерам. Поэтому отдельно показаны построение массивов, их
+обновление после правки EDITED номеров и расчет сводок по готовым массивам.
+
+Запуск: python -m benchmarks.bench_pricing_analytics
+"""
+import numpy as np
+
+from benchmarks.common import make_hotels, make_rooms, timeit
+from viewmodel.analytics import RoomAnalytics
+from viewmodel.reports import pricing_report
+
+ROOMS = 1_000_000
+HOTELS = 10_000
+# Номеров, измененных между двумя расчетами отчета
+EDITED = 100
+
+
+def loop_pricing(rooms):
+    """Расчет так, как его делал show_pricing_stats: списки цен по типам и min / avg / max"""
+    prices_by_type = {}
+    for room in rooms:
+        if room.room_type not in prices_by_type:
+            prices_by_type[room.room_type] = []
+        prices_by_type[room.room_type].append(room.price_per_night)
+    return {
+        "types": list(prices_by_type.keys()),
+        "min": [min(prices) for prices in prices_by_type.values()],
+        "avg": [sum(prices) / len(prices) for prices in prices_by_type.values()],
+        "max": [max(prices) for prices in prices_by_type.values()],
+    }
+
+
+def main():
+    hotels = make_hotels(HOTELS)
+    rooms = make_rooms(ROOMS, HOTELS)
+
+    expected = loop_pricing(rooms)
+    analytics = RoomAnalytics(rooms, hotels)
+    by_type = analytics.by_type()
+    assert by_type["labels"] == expected["types"]
+    for name, field in (("min", "min"), ("avg", "mean"), ("max", "max")):
+        assert np.allclose(by_type[field], expected[name])
+
+    loops = timeit(lambda: loop_pricing(rooms), repeat=3)
+    build = timeit(lambda: RoomAnalytics(rooms, hotels), repeat=3)
+    edited = {room.id: room for room in rooms[::ROOMS // EDITED]}
+    patch = timeit(lambda: analytics.patched(edited, hotels, hotels_changed=False), repeat=5)
+    types = timeit(analytics.by_type, repeat=10)
+    report = timeit(lambda: pricing_report(analytics), repeat=5)
+
+    print(f"{ROOMS} номеров, {HOTELS} отелей\n")
+    print(f"{'циклы Python: min / avg / max по типам':<52} {loops * 1e3:>8.0f} мс")
+    print(f"{'NumPy: построение массивов (первый расчет)':<52} {build * 1e3:>8.0f} мс")
+    print(f"{f'NumPy: обновление массивов после правки {EDITED} номеров':<52} {patch * 1e3:>8.0f} мс")
+    print(f"{'NumPy: min / avg / max / перцентили по типам':<52} {types * 1e3:>8.0f} мс")
+    print(f"{'NumPy: весь отчет (типы, города, звезды, гистограмма)':<52} {report * 1e3:>8.0f} мс")
+
+
+if __name__ == "__main__":
+    main()
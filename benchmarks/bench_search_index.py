@@ -0,0 +1,51 @@
+"""Сравнение текстового поиска номеров: проход по всем записям против индекса триграмм.
+
+Поиск идет по номеру комнаты, типу номера и названию отеля, как в таблице номеров.
+
+Запуск: python -m benchmarks.bench_search_index
+"""
+import time
+
+from benchmarks.common import InMemoryService, make_hotels, make_rooms, timeit
+from viewmodel.hotel_viewmodel import HotelViewModel
+from viewmodel.room_viewmodel import RoomViewModel
+
+ROOMS = 1_000_000
+HOTELS = 10_000
+QUERIES = ["1", "15", "люкс", "семей", "отель 123", "отель 9999", "нет такого"]
+
+
+def linear_search(room_vm, hotel_vm, term):
+    """Поиск так, как он выполнялся до появления индекса"""
+    result = []
+    for room in room_vm.rooms:
+        try:
+            hotel_name = hotel_vm.get_hotel_by_id(room.hotel_id).name
+        except ValueError:
+            hotel_name = "Неизвестно"
+        if (term in room.room_number.lower() or term in room.room_type.lower() or
+                term in hotel_name.lower()):
+            result.append(room.id)
+    return result
+
+
+def main():
+    hotels = make_hotels(HOTELS)
+    service = InMemoryService(hotels, make_rooms(ROOMS, HOTELS))
+    start = time.perf_counter()
+    hotel_vm = HotelViewModel(service)
+    room_vm = RoomViewModel(hotel_vm, service)
+    print(f"Загрузка {ROOMS} номеров с индексами: {time.perf_counter() - start:.2f} с\n")
+
+    print(f"{'запрос':>12} {'найдено':>9} {'проход, мс':>11} {'индекс, мс':>11} {'ускорение':>10}")
+    for term in QUERIES:
+        found = room_vm.search_rooms(term)
+        assert sorted(found) == linear_search(room_vm, hotel_vm, term)
+        linear = timeit(lambda: linear_search(room_vm, hotel_vm, term))
+        indexed = timeit(lambda: room_vm.search_rooms(term), repeat=5)
+        print(f"{term:>12} {len(found):>9} {linear * 1e3:>11.1f} {indexed * 1e3:>11.2f} "
+              f"{linear / indexed:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Сортировка строк таблицы номеров по столбцу: sorted по ключу против упорядоченных индексов viewmodel.
+
+Первая сортировка по столбцу строит индекс, повторные берут порядок из него.
+
+Запуск: python -m benchmarks.bench_sort_orders
+"""
+from benchmarks.common import InMemoryService, make_hotels, make_rooms, timeit
+from viewmodel.hotel_viewmodel import HotelViewModel
+from viewmodel.room_viewmodel import RoomViewModel
+
+ROOMS = 100_000
+HOTELS = 1_000
+FIELDS = ["hotel", "room_number", "room_type", "price_per_night", "is_available"]
+
+
+def main():
+    hotels = make_hotels(HOTELS)
+    service = InMemoryService(hotels, make_rooms(ROOMS, HOTELS))
+    hotel_vm = HotelViewModel(service)
+    room_vm = RoomViewModel(hotel_vm, service)
+    ids = [room.id for room in room_vm.rooms]
+    # Отфильтрованная таблица: каждый третий номер
+    filtered = ids[::3]
+
+    print(f"{'столбец':<16} {'sorted, мс':>11} {'1-я, мс':>9} {'повтор, мс':>11} {'треть строк, мс':>16}")
+    for field in FIELDS:
+        key = room_vm.room_sort_key(field)
+        naive = timeit(lambda: sorted(ids, key=key), repeat=3)
+        first = timeit(lambda: room_vm.sort_rooms(ids, field))
+        again = timeit(lambda: room_vm.sort_rooms(ids, field, descending=True), repeat=10)
+        subset = timeit(lambda: room_vm.sort_rooms(filtered, field), repeat=10)
+        assert room_vm.sort_rooms(filtered, field) == sorted(filtered, key=key)
+        print(f"{field:<16} {naive * 1e3:>11.1f} {first * 1e3:>9.1f} {again * 1e3:>11.1f} {subset * 1e3:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Холодный старт главного окна до первой отрисовки: прежняя схема против отложенной.
+
+eager — как раньше: matplotlib импортируется вместе с модулем, все три раздела
+строятся до показа окна. lazy — matplotlib и разделы «Номера» / «Отчеты»
+загружаются при первом обращении. Каждый замер идет в отдельном процессе,
+чтобы импорт был холодным. Без дисплея замеряется только импорт.
+
+Запуск: python -m benchmarks.bench_startup
+"""
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import InMemoryService, make_hotels, make_rooms
+
+HOTELS = 1_000
+ROOMS = 20_000
+RUNS = 5
+
+
+def child(mode: str):
+    """Один замер в текущем (холодном) процессе; результат — строка JSON"""
+    start = time.perf_counter()
+    if mode == "eager":
+        import matplotlib
+        matplotlib.use('TkAgg')
+        import matplotlib.pyplot
+        import matplotlib.backends.backend_tkagg
+    import custom_main_hotel
+    result = {"import": time.perf_counter() - start}
+
+    service = InMemoryService(make_hotels(HOTELS), make_rooms(ROOMS, HOTELS))
+    hotel_vm = custom_main_hotel.HotelViewModel(service)
+    room_vm = custom_main_hotel.RoomViewModel(hotel_vm, service)
+
+    import tkinter
+    start = time.perf_counter()
+    try:
+        app = custom_main_hotel.CustomMainWindow(hotel_vm, room_vm)
+    except tkinter.TclError:
+        print(json.dumps(result))
+        return
+    if mode == "eager":
+        for section in ("rooms", "reports"):
+            app.ensure_section(section)
+    app.update()
+    result["window"] = time.perf_counter() - start
+    app.destroy()
+    print(json.dumps(result))
+
+
+def measure(mode: str) -> dict:
+    runs = []
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child", mode],
+                                capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def main():
+    results = {mode: measure(mode) for mode in ("eager", "lazy")}
+    print(f"Медиана из {RUNS} запусков, {HOTELS} отелей / {ROOMS} номеров\n")
+    print(f"{'режим':<8} {'импорт, мс':>11} {'окно до отрисовки, мс':>22} {'итого, мс':>10}")
+    for mode, result in results.items():
+        window = result.get("window")
+        total = result["import"] + (window or 0)
+        window_text = f"{window * 1e3:.0f}" if window is not None else "нет дисплея"
+        print(f"{mode:<8} {result['import'] * 1e3:>11.0f} {window_text:>22} {total * 1e3:>10.0f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        child(sys.argv[2])
+    else:
+        main()
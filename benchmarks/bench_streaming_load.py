@@ -0,0 +1,47 @@
+"""Пиковая память и время загрузки rooms.json: json.load против поэлементного разбора.
+
+Каждый режим запускается в отдельном процессе, чтобы пиковый RSS не смешивался.
+Запуск: python -m benchmarks.bench_streaming_load
+"""
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import make_rooms
+from service.json_service import JSONService
+
+SIZES = [200_000, 1_000_000]
+
+MEASURE = """
+import resource, sys, time
+from model.room import Room
+from service.json_service import JSONService
+service = JSONService(sys.argv[1], streaming=sys.argv[2] == "1")
+start = time.perf_counter()
+rooms = service.load_data("rooms.json", Room)
+elapsed = time.perf_counter() - start
+print(len(rooms), elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def measure(data_dir: str, streaming: bool):
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE, data_dir, "1" if streaming else "0"],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[1]), int(output[2]) / 1024
+
+
+def main():
+    print(f"{'номеров':>10} {'режим':>10} {'время, с':>9} {'пик RSS, МБ':>12}")
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as data_dir:
+            JSONService(data_dir).save_data("rooms.json", make_rooms(size, max(size // 100, 1)))
+            for streaming in (False, True):
+                elapsed, peak_mb = measure(data_dir, streaming)
+                mode = "поток" if streaming else "json.load"
+                print(f"{size:>10} {mode:>10} {elapsed:>9.2f} {peak_mb:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
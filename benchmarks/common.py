@@ -0,0 +1,131 @@
+"""Общие утилиты для бенчмарков.
+
+Запуск из корня репозитория: python -m benchmarks.<имя_модуля>
+"""
+import random
+import time
+from typing import Callable, List
+
+from model.hotel import Hotel
+from model.room import Room
+
+# Данные правдоподобны: города, звездность, типы номеров и цены распределены
+# неравномерно, как в реальном портфеле; одинаковые параметры и seed дают одни и те же данные.
+# Город → (доля отелей, ценовой коэффициент)
+CITY_PROFILES = {
+    "Москва": (30, 1.6),
+    "Санкт-Петербург": (20, 1.4),
+    "Сочи": (12, 1.5),
+    "Казань": (9, 1.0),
+    "Екатеринбург": (8, 1.0),
+    "Новосибирск": (7, 0.9),
+    "Нижний Новгород": (6, 0.9),
+    "Калининград": (5, 1.1),
+    "Волгоград": (3, 0.8),
+}
+# Звезды → (доля отелей, базовая цена стандартного номера, вероятность бассейна, средний размер отеля)
+STAR_PROFILES = {
+    1: (6, 1500, 0.02, 15),
+    2: (14, 2300, 0.05, 25),
+    3: (38, 3500, 0.15, 60),
+    4: (28, 5500, 0.45, 120),
+    5: (14, 10000, 0.85, 200),
+}
+# Тип номера → (доля номеров, множитель цены)
+ROOM_TYPE_PROFILES = {
+    "Стандарт": (55, 1.0),
+    "Бизнес": (18, 1.6),
+    "Семейный": (13, 1.4),
+    "Люкс": (9, 2.6),
+    "Премиум": (5, 3.8),
+}
+ROOM_TYPES = list(ROOM_TYPE_PROFILES)
+CITIES = list(CITY_PROFILES)
+HOTEL_NAMES = ["Гранд", "Парк", "Ривьера", "Европа", "Сити", "Панорама", "Престиж", "Невский",
+               "Волна", "Азимут", "Космос", "Империал", "Арбат", "Лазурь", "Северная звезда"]
+STREETS = ["ул. Ленина", "пр. Мира", "ул. Советская", "наб. Центральная", "ул. Гагарина",
+           "пр. Победы", "ул. Садовая", "ул. Пушкина", "Курортный пр.", "ул. Морская"]
+# Доля занятых номеров растет со звездностью отеля
+OCCUPANCY = {1: 0.45, 2: 0.5, 3: 0.6, 4: 0.65, 5: 0.7}
+
+
+class InMemoryService:
+    """Хранилище в памяти с интерфейсом JSONService, исключающее дисковый ввод-вывод."""
+
+    def __init__(self, hotels: List[Hotel] = None, rooms: List[Room] = None):
+        self._data = {"hotels.json": hotels or [], "rooms.json": rooms or []}
+
+    def load_data(self, filename: str, model_class):
+        return list(self._data.get(filename, []))
+
+    def save_data(self, filename: str, data):
+        pass
+
+    def save_items(self, filename: str, items, all_items):
+        pass
+
+    def delete_items(self, filename: str, ids, all_items):
+        pass
+
+    def load_last_id(self, filename: str) -> int:
+        return 0
+
+    def save_last_id(self, filename: str, last_id: int):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _choices(rnd: random.Random, table: dict, count: int) -> list:
+    return rnd.choices(list(table), weights=[row[0] for row in table.values()], k=count)
+
+
+def make_hotels(count: int, seed: int = 0) -> List[Hotel]:
+    """Отели с ID 1..count; названия уникальны"""
+    rnd = random.Random(seed)
+    cities = _choices(rnd, CITY_PROFILES, count)
+    stars = _choices(rnd, STAR_PROFILES, count)
+    hotels = []
+    for i, (city, star) in enumerate(zip(cities, stars), start=1):
+        name = f"{rnd.choice(HOTEL_NAMES)} {i}"
+        address = f"{rnd.choice(STREETS)}, {rnd.randint(1, 200)}"
+        hotels.append(Hotel(i, name, city, address, star, rnd.random() < STAR_PROFILES[star][2]))
+    return hotels
+
+
+def make_rooms_for(hotels: List[Hotel], count: int, seed: int = 0) -> List[Room]:
+    """Номера с ID 1..count, распределенные по отелям пропорционально их размеру"""
+    if not hotels:
+        return []
+    rnd = random.Random(seed + 1)
+    owners = rnd.choices(hotels, weights=[STAR_PROFILES[hotel.stars][3] for hotel in hotels], k=count)
+    types = _choices(rnd, ROOM_TYPE_PROFILES, count)
+    numbers = {}
+    rooms = []
+    for i, (hotel, room_type) in enumerate(zip(owners, types), start=1):
+        # Номера комнат по этажам: 101, 102, ... 120, 201, ...
+        index = numbers.get(hotel.id, 0)
+        numbers[hotel.id] = index + 1
+        room_number = str((index // 20 + 1) * 100 + index % 20 + 1)
+        base = STAR_PROFILES[hotel.stars][1] * CITY_PROFILES[hotel.city][1] * ROOM_TYPE_PROFILES[room_type][1]
+        # Разброс ±25%, цена округляется до 100 руб.
+        price = float(round(base * rnd.uniform(0.75, 1.25), -2))
+        rooms.append(Room(i, hotel.id, room_number, room_type, price, rnd.random() >= OCCUPANCY[hotel.stars]))
+    return rooms
+
+
+def make_rooms(count: int, hotel_count: int, seed: int = 0) -> List[Room]:
+    """Номера для отелей make_hotels(hotel_count, seed)"""
+    return make_rooms_for(make_hotels(hotel_count, seed), count, seed)
+
+
+def timeit(func: Callable[[], object], repeat: int = 1) -> float:
+    """Среднее время одного вызова в секундах"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
@@ -0,0 +1,47 @@
+"""Запись сгенерированных отелей и номеров в каталог данных приложения.
+
+Данные строят make_hotels / make_rooms_for из benchmarks.common — те же, что
+в остальных бенчмарках: города, доли звездности, типы номеров и цены
+распределены неравномерно, как в реальном портфеле. Одинаковые параметры и
+seed всегда дают одни и те же данные.
+
+Запуск: python -m benchmarks.data_generator --hotels 1000 --rooms 100000 --out data_bench
+"""
+import argparse
+from typing import List, Tuple
+
+from benchmarks.common import make_hotels, make_rooms_for
+from model.hotel import Hotel
+from model.room import Room
+from service.json_service import JSONService
+
+
+def generate(hotel_count: int, room_count: int, seed: int = 0) -> Tuple[List[Hotel], List[Room]]:
+    hotels = make_hotels(hotel_count, seed)
+    return hotels, make_rooms_for(hotels, room_count, seed)
+
+
+def write_data(data_dir: str, hotels: List[Hotel], rooms: List[Room]):
+    """Запись данных в формате приложения (hotels.json, rooms.json, sequences.json)"""
+    service = JSONService(data_dir, fsync=False, backup=False)
+    service.save_data("hotels.json", hotels)
+    service.save_data("rooms.json", rooms)
+    service.save_last_id("hotels.json", len(hotels))
+    service.save_last_id("rooms.json", len(rooms))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация тестовых данных отелей и номеров")
+    parser.add_argument("--hotels", type=int, default=1_000)
+    parser.add_argument("--rooms", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="каталог для hotels.json и rooms.json")
+    args = parser.parse_args()
+
+    hotels, rooms = generate(args.hotels, args.rooms, args.seed)
+    write_data(args.out, hotels, rooms)
+    print(f"Записано отелей: {len(hotels)}, номеров: {len(rooms)} в {args.out}")
+
+
+if __name__ == "__main__":
+    main()
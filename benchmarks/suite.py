@@ -0,0 +1,247 @@
+"""Набор бенчмарков основных операций на сгенерированных данных.
+
+Покрывает загрузку и сохранение (JSONService), добавление, изменение и
+удаление (viewmodel), поиск и фильтрацию, чтение статистики и расчет
+отчетов. Данные строит benchmarks.data_generator, поэтому при одинаковых
+--scale и --seed замеры разных версий кода сопоставимы. Результаты
+записываются в JSON; --compare сравнивает их с прошлым файлом результатов.
+
+Запуск: python -m benchmarks.suite --scale medium --compare benchmarks/results/<прошлый>.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from benchmarks.common import InMemoryService
+from benchmarks.data_generator import generate, write_data
+from service.json_service import JSONService
+from viewmodel.hotel_viewmodel import HotelViewModel
+from viewmodel.room_viewmodel import RoomViewModel
+
+# Масштаб → (отелей, номеров)
+SCALES = {
+    "small": (100, 10_000),
+    "medium": (1_000, 100_000),
+    "large": (10_000, 1_000_000),
+}
+# Число одиночных изменений в замерах add / update / delete
+OPERATIONS = 500
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+class Context:
+    """Параметры прогона и каталог с записанными на диск данными"""
+
+    def __init__(self, hotels: int, rooms: int, seed: int, data_dir: str):
+        self.hotels = hotels
+        self.rooms = rooms
+        self.seed = seed
+        self.data_dir = data_dir
+
+    def view_models(self):
+        """Свежие viewmodel поверх хранилища в памяти: замер без дискового ввода-вывода"""
+        hotels, rooms = generate(self.hotels, self.rooms, self.seed)
+        service = InMemoryService(hotels, rooms)
+        hotel_vm = HotelViewModel(service)
+        return hotel_vm, RoomViewModel(hotel_vm, service)
+
+
+def _timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def bench_load(ctx: Context) -> float:
+    """Чтение hotels.json / rooms.json и построение viewmodel со всеми индексами"""
+    def load():
+        service = JSONService(ctx.data_dir)
+        hotel_vm = HotelViewModel(service)
+        RoomViewModel(hotel_vm, service)
+    return _timed(load)
+
+
+def bench_save(ctx: Context) -> float:
+    """Полная перезапись обоих файлов данных"""
+    hotels, rooms = generate(ctx.hotels, ctx.rooms, ctx.seed)
+    with tempfile.TemporaryDirectory() as data_dir:
+        service = JSONService(data_dir, fsync=False, backup=False)
+        return _timed(lambda: (service.save_data("hotels.json", hotels), service.save_data("rooms.json", rooms)))
+
+
+def bench_add(ctx: Context) -> float:
+    hotel_vm, room_vm = ctx.view_models()
+    hotel_ids = [hotel.id for hotel in hotel_vm.hotels]
+
+    def add():
+        for i in range(OPERATIONS):
+            room_vm.add_room(hotel_ids[i % len(hotel_ids)], f"B{i}", "Стандарт", 3000.0)
+        hotel_vm.add_hotel("Бенчмарк", "Москва", "ул. Тестовая, 1", 3, False)
+    return _timed(add)
+
+
+def bench_update(ctx: Context) -> float:
+    hotel_vm, room_vm = ctx.view_models()
+    rooms = room_vm.rooms[::max(len(room_vm.rooms) // OPERATIONS, 1)][:OPERATIONS]
+
+    def update():
+        for room in rooms:
+            room_vm.update_room(room.id, room.hotel_id, room.room_number, "Люкс",
+                                room.price_per_night * 1.1, not room.is_available)
+    return _timed(update)
+
+
+def bench_delete(ctx: Context) -> float:
+    hotel_vm, room_vm = ctx.view_models()
+    ids = [room.id for room in room_vm.rooms[::max(len(room_vm.rooms) // OPERATIONS, 1)][:OPERATIONS]]
+    return _timed(lambda: [room_vm.delete_room(room_id) for room_id in ids])
+
+
+def bench_search(ctx: Context) -> float:
+    """Поиск подстроки, фасетные фильтры, выборка по цене и сортировка"""
+    hotel_vm, room_vm = ctx.view_models()
+    ids = [room.id for room in room_vm.rooms]
+
+    def search():
+        for term in ("10", "люкс", "гранд"):
+            room_vm.search_rooms(term)
+            hotel_vm.search_hotels(term)
+        room_vm.filter_rooms(is_available=True, room_type="Люкс")
+        hotel_vm.filter_hotels(city="Москва", stars=5)
+        room_vm.find_rooms(min_price=5000, max_price=8000, city="Москва", is_available=True, limit=50)
+        room_vm.sort_rooms(ids, "price_per_night")
+    return _timed(search)
+
+
+def bench_stats(ctx: Context) -> float:
+    """Чтение счетчиков боковой панели и счетчиков фильтров окна номеров"""
+    hotel_vm, room_vm = ctx.view_models()
+
+    def stats():
+        for _ in range(OPERATIONS):
+            cards = (hotel_vm.stats.total, room_vm.stats.total, room_vm.stats.available, hotel_vm.stats.by_stars[5])
+        assert cards[0] == ctx.hotels
+        for field in ("hotel_id", "is_available", "room_type"):
+            room_vm.facet_counts(field, is_available=True)
+    return _timed(stats)
+
+
+def bench_reports(ctx: Context) -> Optional[float]:
+    """Расчет данных всех отчетов (без отрисовки); нужен NumPy"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return None
+    from viewmodel.reports import HOTELS_REPORT, ROOMS_REPORT, PRICING_REPORT, take_snapshot
+    hotel_vm, room_vm = ctx.view_models()
+    return _timed(lambda: [take_snapshot(report, hotel_vm, room_vm)()
+                           for report in (HOTELS_REPORT, ROOMS_REPORT, PRICING_REPORT)])
+
+
+BENCHMARKS: Dict[str, Callable[[Context], Optional[float]]] = {
+    "load": bench_load,
+    "save": bench_save,
+    "add": bench_add,
+    "update": bench_update,
+    "delete": bench_delete,
+    "search": bench_search,
+    "stats": bench_stats,
+    "reports": bench_reports,
+}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(scale: str, seed: int, repeat: int, only=None) -> Dict:
+    hotel_count, room_count = SCALES[scale]
+    results = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_data(data_dir, *generate(hotel_count, room_count, seed))
+        ctx = Context(hotel_count, room_count, seed, data_dir)
+        for name, bench in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            runs = [bench(ctx) for _ in range(repeat)]
+            if None in runs:
+                print(f"{name:<8} пропущен")
+                continue
+            results[name] = {"median": statistics.median(runs), "runs": runs}
+            print(f"{name:<8} {results[name]['median'] * 1e3:>10.1f} мс")
+    return {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "scale": scale,
+        "hotels": hotel_count,
+        "rooms": room_count,
+        "seed": seed,
+        "operations": OPERATIONS,
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> int:
+    """Сравнение с прошлым прогоном; возвращает число регрессий"""
+    if (baseline["hotels"], baseline["rooms"], baseline["seed"]) != (current["hotels"], current["rooms"], current["seed"]):
+        print("\nВнимание: прошлый прогон сделан на других данных — сравнение неточно")
+    print(f"\nСравнение с {baseline['revision']} ({baseline['timestamp']})")
+    print(f"{'замер':<8} {'было, мс':>10} {'стало, мс':>10} {'отношение':>10}")
+    regressions = 0
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        ratio = result["median"] / old["median"] if old["median"] else float("inf")
+        mark = ""
+        if ratio > 1 + threshold:
+            regressions += 1
+            mark = "  регрессия"
+        print(f"{name:<8} {old['median'] * 1e3:>10.1f} {result['median'] * 1e3:>10.1f} {ratio:>9.2f}x{mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки операций над отелями и номерами")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="повторов каждого замера (берется медиана)")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="запустить только эти замеры")
+    parser.add_argument("--output", help="файл результатов (по умолчанию benchmarks/results/<ревизия>-<масштаб>.json)")
+    parser.add_argument("--compare", help="файл результатов прошлого прогона для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="замедление, считающееся регрессией (0.2 — на 20%%)")
+    args = parser.parse_args()
+
+    hotel_count, room_count = SCALES[args.scale]
+    print(f"Масштаб {args.scale}: {hotel_count} отелей, {room_count} номеров, seed {args.seed}\n")
+    current = run_suite(args.scale, args.seed, args.repeat, args.only)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{current['revision']}-{args.scale}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, ensure_ascii=False, indent=2)
+    print(f"\nРезультаты записаны в {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
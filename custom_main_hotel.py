@@ -1,13 +1,18 @@
+import argparse
+import base64
+import tkinter as tk
 import customtkinter as ctk
 from view.custom_hotel_window import CustomHotelWindow
 from view.custom_room_window import CustomRoomWindow
+from view.incremental_search import IncrementalSearch
+from view.report_charts import ReportRunner
+from view.virtual_table import VirtualTable
 from viewmodel.hotel_viewmodel import HotelViewModel
 from viewmodel.room_viewmodel import RoomViewModel
 from service.json_service import JSONService
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib
-matplotlib.use('TkAgg')
+from viewmodel.events import ChangeEvent, UPDATED
+from viewmodel.reports import (HOTELS_REPORT, ROOMS_REPORT, PRICING_REPORT, AnalyticsCache, ReportCache,
+                               report_version, take_snapshot)
 
 class CustomMainWindow(ctk.CTk):
     def __init__(self, hotel_vm, room_vm):
@@ -21,10 +26,25 @@ class CustomMainWindow(ctk.CTk):
         self.hotel_vm = hotel_vm
         self.room_vm = room_vm
         self.current_section = "hotels"
+        # Разделы, интерфейс которых уже построен; остальные строятся при первом показе
+        self.built_sections = set()
         
         self.create_sidebar()
         self.create_main_content()
         self.refresh_data()
+        self.hotel_vm.subscribe(self.on_hotels_changed)
+        self.room_vm.subscribe(self.on_rooms_changed)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """Запись отложенных изменений перед закрытием окна"""
+        if "reports" in self.built_sections:
+            self.report_runner.cancel()
+        try:
+            self.hotel_vm.flush()
+            self.room_vm.flush()
+        finally:
+            self.destroy()
 
     def create_sidebar(self):
         """Создание боковой панели"""
@@ -143,11 +163,13 @@ class CustomMainWindow(ctk.CTk):
         self.rooms_frame = ctk.CTkFrame(self.main_content, corner_radius=0)
         self.reports_frame = ctk.CTkFrame(self.main_content, corner_radius=0)
         
-        self.create_hotels_section()
-        self.create_rooms_section()
-        self.create_reports_section()
+        self.section_builders = {
+            "hotels": self.create_hotels_section,
+            "rooms": self.create_rooms_section,
+            "reports": self.create_reports_section,
+        }
         
-        # Показываем начальный раздел
+        # Показываем начальный раздел; остальные будут построены при первом переходе
         self.show_section("hotels")
 
     def create_hotels_section(self):
@@ -189,7 +211,7 @@ class CustomMainWindow(ctk.CTk):
             height=35
         )
         self.hotels_search_entry.pack(side="left", fill="x", expand=True)
-        self.hotels_search_entry.bind("<KeyRelease>", lambda e: self.refresh_hotels_data())
+        self.hotels_search_entry.bind("<KeyRelease>", lambda e: self.refresh_hotels_data(debounce=True))
         
         # Таблица отелей
         self.create_hotels_table()
@@ -230,7 +252,7 @@ class CustomMainWindow(ctk.CTk):
             height=35
         )
         self.rooms_search_entry.pack(side="left", fill="x", expand=True)
-        self.rooms_search_entry.bind("<KeyRelease>", lambda e: self.refresh_rooms_data())
+        self.rooms_search_entry.bind("<KeyRelease>", lambda e: self.refresh_rooms_data(debounce=True))
         
         # Таблица номеров
         self.create_rooms_table()
@@ -272,6 +294,13 @@ class CustomMainWindow(ctk.CTk):
         # Фрейм для графиков
         self.chart_frame = ctk.CTkFrame(self.reports_frame)
         self.chart_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        self.chart_image = None
+        # Отчеты считаются и рисуются в фоне; окно показывает готовое изображение
+        # Повторный показ без изменений данных берется из кэша без пересчета и перерисовки
+        self.report_cache = ReportCache()
+        # Массивы NumPy для анализа цен строятся один раз на версию данных
+        self.analytics_cache = AnalyticsCache()
+        self.report_runner = ReportRunner(self, self.on_report_ready, self.on_report_failed, self.report_cache)
 
     def create_hotels_table(self):
         """Создание таблицы отелей"""
@@ -291,8 +320,10 @@ class CustomMainWindow(ctk.CTk):
                        relief="flat")
         style.map('Hotels.Treeview', background=[('selected', '#1f6aa5')])
         
-        self.hotels_tree = ttk.Treeview(self.hotels_frame, columns=columns, show="headings", 
-                                      style="Hotels.Treeview", height=15)
+        # Виртуальная таблица: Tk-строки создаются только для видимого окна
+        self.hotels_table = VirtualTable(self.hotels_frame, columns,
+                                     lambda hotel_id: self.hotel_row_values(self.hotel_vm.get_hotel_by_id(hotel_id)),
+                                     style="Hotels.Treeview", height=15)
         
         column_config = {
             "ID": 70, "Отель": 250, "Город": 150, 
@@ -300,14 +331,21 @@ class CustomMainWindow(ctk.CTk):
         }
         
         for col in columns:
-            self.hotels_tree.heading(col, text=col)
-            self.hotels_tree.column(col, width=column_config[col])
-        
-        scrollbar = ttk.Scrollbar(self.hotels_frame, orient="vertical", command=self.hotels_tree.yview)
-        self.hotels_tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.hotels_tree.pack(fill="both", expand=True, padx=20, pady=10)
-        scrollbar.pack(side="right", fill="y", padx=(0, 20), pady=10)
+            self.hotels_table.heading(col, text=col)
+            self.hotels_table.column(col, width=column_config[col])
+
+        # Сортировка по щелчку на заголовке; «Номеров» считается из RoomViewModel без индекса
+        sort_fields = {"ID": "id", "Отель": "name", "Город": "city", "Звезды": "stars", "Бассейн": "has_pool"}
+        for col, field in sort_fields.items():
+            self.hotels_table.make_sortable(col, self.hotel_vm.hotel_sort_key(field),
+                                            lambda ids, reverse, field=field: self.hotel_vm.sort_hotels(ids, field, reverse))
+        self.hotels_table.make_sortable("Номеров",
+                                        lambda hotel_id: (self.room_vm.count_rooms_in_hotel(hotel_id), hotel_id))
+        
+        self.hotels_table.tree.pack(fill="both", expand=True, padx=20, pady=10)
+        self.hotels_table.scrollbar.pack(side="right", fill="y", padx=(0, 20), pady=10)
+        self.hotels_search = IncrementalSearch(self, self.hotels_table, lambda: self.hotel_vm.hotels,
+                                               self.hotel_vm.get_hotel_by_id, self.lookup_hotels)
 
     def create_rooms_table(self):
         """Создание таблицы номеров"""
@@ -327,7 +365,9 @@ class CustomMainWindow(ctk.CTk):
                        relief="flat")
         style.map('Rooms.Treeview', background=[('selected', '#1f6aa5')])
         
-        self.rooms_tree = ttk.Treeview(self.rooms_frame, columns=columns, show="headings", 
+        # Виртуальная таблица: Tk-строки создаются только для видимого окна
+        self.rooms_table = VirtualTable(self.rooms_frame, columns,
+                                     lambda room_id: self.room_row_values(self.room_vm.get_room_by_id(room_id)),
                                      style="Rooms.Treeview", height=15)
         
         column_config = {
@@ -336,17 +376,33 @@ class CustomMainWindow(ctk.CTk):
         }
         
         for col in columns:
-            self.rooms_tree.heading(col, text=col)
-            self.rooms_tree.column(col, width=column_config[col])
-        
-        scrollbar = ttk.Scrollbar(self.rooms_frame, orient="vertical", command=self.rooms_tree.yview)
-        self.rooms_tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.rooms_tree.pack(fill="both", expand=True, padx=20, pady=10)
-        scrollbar.pack(side="right", fill="y", padx=(0, 20), pady=10)
+            self.rooms_table.heading(col, text=col)
+            self.rooms_table.column(col, width=column_config[col])
+
+        # Сортировка по щелчку на заголовке берется из упорядоченных индексов viewmodel
+        sort_fields = {
+            "ID": "id", "Отель": "hotel", "Номер": "room_number",
+            "Тип": "room_type", "Цена": "price_per_night", "Статус": "is_available"
+        }
+        for col, field in sort_fields.items():
+            self.rooms_table.make_sortable(col, self.room_vm.room_sort_key(field),
+                                           lambda ids, reverse, field=field: self.room_vm.sort_rooms(ids, field, reverse))
+        
+        self.rooms_table.tree.pack(fill="both", expand=True, padx=20, pady=10)
+        self.rooms_table.scrollbar.pack(side="right", fill="y", padx=(0, 20), pady=10)
+        self.rooms_search = IncrementalSearch(self, self.rooms_table, lambda: self.room_vm.rooms,
+                                              self.room_vm.get_room_by_id, self.lookup_rooms)
+
+    def ensure_section(self, section):
+        """Построение интерфейса раздела при первом обращении"""
+        if section not in self.built_sections:
+            self.section_builders[section]()
+            self.built_sections.add(section)
 
     def show_section(self, section):
         """Показать выбранный раздел"""
+        self.ensure_section(section)
+        
         # Скрыть все разделы
         self.hotels_frame.pack_forget()
         self.rooms_frame.pack_forget()
@@ -398,203 +454,199 @@ class CustomMainWindow(ctk.CTk):
 
     def refresh_stats(self):
         """Обновление статистики"""
-        total_hotels = len(self.hotel_vm.hotels)
-        total_rooms = len(self.room_vm.rooms)
-        available_rooms = sum(1 for room in self.room_vm.rooms if room.is_available)
-        five_star_hotels = sum(1 for hotel in self.hotel_vm.hotels if hotel.stars == 5)
+        # Счетчики поддерживаются viewmodel при каждом изменении — проход по данным не нужен
+        total_hotels = self.hotel_vm.stats.total
+        total_rooms = self.room_vm.stats.total
+        available_rooms = self.room_vm.stats.available
+        five_star_hotels = self.hotel_vm.stats.by_stars[5]
         
         self.stats_cards["total_hotels"].configure(text=str(total_hotels))
         self.stats_cards["total_rooms"].configure(text=str(total_rooms))
         self.stats_cards["available_rooms"].configure(text=str(available_rooms))
         self.stats_cards["five_star_hotels"].configure(text=str(five_star_hotels))
 
-    def refresh_hotels_data(self):
-        """Обновление данных отелей"""
-        for item in self.hotels_tree.get_children():
-            self.hotels_tree.delete(item)
-        
-        search_term = self.hotels_search_entry.get().lower() if hasattr(self, 'hotels_search_entry') else ""
-        
-        for hotel in self.hotel_vm.hotels:
-            if search_term and (search_term not in hotel.name.lower() and 
-                              search_term not in hotel.city.lower()):
-                continue
-            
-            # Подсчет номеров в отеле
-            room_count = sum(1 for room in self.room_vm.rooms if room.hotel_id == hotel.id)
-            pool = "✅ Есть" if hotel.has_pool else "❌ Нет"
-            stars_display = "⭐" * hotel.stars
-            
-            self.hotels_tree.insert("", "end", values=(
-                hotel.id, hotel.name, hotel.city, stars_display, pool, room_count
-            ))
+    def hotels_search_term(self):
+        return self.hotels_search_entry.get().lower() if hasattr(self, 'hotels_search_entry') else ""
 
-    def refresh_rooms_data(self):
-        """Обновление данных номеров"""
-        for item in self.rooms_tree.get_children():
-            self.rooms_tree.delete(item)
-        
-        search_term = self.rooms_search_entry.get().lower() if hasattr(self, 'rooms_search_entry') else ""
-        
-        # Создаем словарь для быстрого доступа к отелям
-        hotel_map = {hotel.id: hotel.name for hotel in self.hotel_vm.hotels}
-        
-        for room in self.room_vm.rooms:
-            hotel_name = hotel_map.get(room.hotel_id, "Неизвестно")
-            
-            if search_term and (search_term not in room.room_number.lower() and 
-                              search_term not in hotel_name.lower()):
-                continue
-            
-            status = "✅ Доступен" if room.is_available else "❌ Занят"
-            price = f"{room.price_per_night:,.0f} руб.".replace(",", " ")
-            
-            self.rooms_tree.insert("", "end", values=(
-                room.id, hotel_name, room.room_number, room.room_type, price, status
-            ))
+    def rooms_search_term(self):
+        return self.rooms_search_entry.get().lower() if hasattr(self, 'rooms_search_entry') else ""
+
+    def hotel_matches(self, hotel, search_term):
+        """Подходит ли отель под строку поиска"""
+        return not search_term or search_term in hotel.name.lower() or search_term in hotel.city.lower()
+
+    def lookup_hotels(self, key):
+        """Кандидаты поиска отелей из индекса (по названию и городу)"""
+        search_term, = key
+        return self.hotel_vm.search_hotels(search_term, ("name", "city")) if search_term else None
+
+    def hotel_row_values(self, hotel):
+        """Значения строки таблицы отелей"""
+        # Подсчет номеров в отеле
+        room_count = self.room_vm.count_rooms_in_hotel(hotel.id)
+        pool = "✅ Есть" if hotel.has_pool else "❌ Нет"
+        stars_display = "⭐" * hotel.stars
+        return (hotel.id, hotel.name, hotel.city, stars_display, pool, room_count)
+
+    def room_hotel_name(self, room):
+        try:
+            return self.hotel_vm.get_hotel_by_id(room.hotel_id).name
+        except ValueError:
+            return "Неизвестно"
+
+    def room_matches(self, room, search_term):
+        """Подходит ли номер под строку поиска"""
+        return (not search_term or search_term in room.room_number.lower() or
+                search_term in self.room_hotel_name(room).lower())
+
+    def lookup_rooms(self, key):
+        """Кандидаты поиска номеров из индекса (по номеру комнаты и названию отеля)"""
+        search_term, = key
+        return self.room_vm.search_rooms(search_term, ("room_number",)) if search_term else None
+
+    def room_row_values(self, room):
+        """Значения строки таблицы номеров"""
+        status = "✅ Доступен" if room.is_available else "❌ Занят"
+        price = f"{room.price_per_night:,.0f} руб.".replace(",", " ")
+        return (room.id, self.room_hotel_name(room), room.room_number, room.room_type, price, status)
+
+    def refresh_hotels_data(self, debounce: bool = False):
+        """Обновление данных отелей; debounce — отложенный поиск при вводе"""
+        search_term = self.hotels_search_term()
+        self.hotels_search.search((search_term,), lambda hotel: self.hotel_matches(hotel, search_term),
+                                  delay=None if debounce else 0, narrow=debounce)
+
+    def refresh_rooms_data(self, debounce: bool = False):
+        """Обновление данных номеров; debounce — отложенный поиск при вводе"""
+        search_term = self.rooms_search_term()
+        self.rooms_search.search((search_term,), lambda room: self.room_matches(room, search_term),
+                                 delay=None if debounce else 0, narrow=debounce)
+
+    def on_hotels_changed(self, event):
+        """Построчное обновление таблиц после изменения отелей"""
+        self.refresh_stats()
+        # Непостроенные разделы заполнятся заново при первом показе
+        if "hotels" in self.built_sections:
+            hotels_term = self.hotels_search_term()
+            self.hotels_search.apply_change_event(event, lambda hotel: self.hotel_matches(hotel, hotels_term))
+        if event.kind == UPDATED and "rooms" in self.built_sections:
+            # Название отеля отображается и в строках его номеров
+            rooms_term = self.rooms_search_term()
+            room_ids = [room.id for hotel_id in event.ids for room in self.room_vm.get_rooms_by_hotel(hotel_id)]
+            self.rooms_search.apply_change_event(ChangeEvent(UPDATED, room_ids),
+                                                 lambda room: self.room_matches(room, rooms_term))
+
+    def on_rooms_changed(self, event):
+        """Построчное обновление таблиц после изменения номеров"""
+        self.refresh_stats()
+        if "rooms" in self.built_sections:
+            rooms_term = self.rooms_search_term()
+            self.rooms_search.apply_change_event(event, lambda room: self.room_matches(room, rooms_term))
+        # Пересчет колонки «Номеров» у видимых строк отелей
+        if "hotels" not in self.built_sections:
+            return
+        if self.hotels_table.sort_column == "Номеров":
+            self.hotels_table.resort()
+        else:
+            self.hotels_table.render()
 
     def open_hotels_management(self):
         """Открыть управление отелями"""
         window = CustomHotelWindow(self, self.hotel_vm)
         self.wait_window(window)
-        self.refresh_data()
 
     def open_rooms_management(self):
         """Открыть управление номерами"""
         window = CustomRoomWindow(self, self.room_vm, self.hotel_vm)
         self.wait_window(window)
-        self.refresh_data()
 
-    def show_hotels_stats(self):
-        """Показать статистику отелей"""
+    def clear_chart_frame(self):
         for widget in self.chart_frame.winfo_children():
             widget.destroy()
-        
-        # Анализ данных отелей
-        cities = {}
-        stars = {}
-        
-        for hotel in self.hotel_vm.hotels:
-            # По городам
-            if hotel.city not in cities:
-                cities[hotel.city] = 0
-            cities[hotel.city] += 1
-            
-            # По звездам
-            if hotel.stars not in stars:
-                stars[hotel.stars] = 0
-            stars[hotel.stars] += 1
-        
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-        
-        # Диаграмма по городам
-        if cities:
-            ax1.pie(cities.values(), labels=cities.keys(), autopct='%1.1f%%', startangle=90)
-            ax1.set_title('Распределение отелей по городам')
-        
-        # Диаграмма по звездам
-        if stars:
-            star_labels = [f"{star}⭐" for star in sorted(stars.keys())]
-            star_values = [stars[star] for star in sorted(stars.keys())]
-            ax2.bar(star_labels, star_values, color=['gold', 'silver', 'brown', 'lightblue', 'lightgreen'])
-            ax2.set_title('Распределение отелей по звездам')
-            ax2.set_ylabel('Количество отелей')
-        
-        plt.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.chart_image = None
+
+    def show_report(self, report):
+        """Запуск отчета в фоне с индикатором выполнения; прежний запуск отменяется"""
+        key = (report, report_version(report, self.hotel_vm, self.room_vm))
+        cached = self.report_cache.get(key)
+        if cached is not None:
+            self.report_runner.cancel()
+            self.on_report_ready(report, cached.image)
+            return
+        compute = take_snapshot(report, self.hotel_vm, self.room_vm, self.analytics_cache)
+        self.clear_chart_frame()
+        ctk.CTkLabel(self.chart_frame, text="⏳ Формирование отчета...").pack(pady=(40, 10))
+        progress = ctk.CTkProgressBar(self.chart_frame, mode="indeterminate", width=300)
+        progress.pack()
+        progress.start()
+        self.report_runner.run(report, compute, key)
+
+    def on_report_ready(self, report, image):
+        """Показ готового изображения отчета"""
+        self.clear_chart_frame()
+        self.chart_image = tk.PhotoImage(data=base64.b64encode(image))
+        tk.Label(self.chart_frame, image=self.chart_image, borderwidth=0).pack(fill="both", expand=True)
+
+    def on_report_failed(self, report, error):
+        self.clear_chart_frame()
+        ctk.CTkLabel(self.chart_frame, text=f"❌ Не удалось построить отчет: {error}",
+                     text_color="#e74c3c").pack(pady=40)
+
+    def show_hotels_stats(self):
+        """Показать статистику отелей"""
+        self.show_report(HOTELS_REPORT)
 
     def show_rooms_stats(self):
         """Показать статистику номеров"""
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
-        
-        # Анализ данных номеров
-        room_types = {}
-        availability = {"Доступно": 0, "Занято": 0}
-        
-        for room in self.room_vm.rooms:
-            # По типам номеров
-            if room.room_type not in room_types:
-                room_types[room.room_type] = 0
-            room_types[room.room_type] += 1
-            
-            # По доступности
-            if room.is_available:
-                availability["Доступно"] += 1
-            else:
-                availability["Занято"] += 1
-        
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-        
-        # Диаграмма по типам номеров
-        if room_types:
-            ax1.pie(room_types.values(), labels=room_types.keys(), autopct='%1.1f%%', startangle=90)
-            ax1.set_title('Распределение номеров по типам')
-        
-        # Диаграмма по доступности
-        if availability:
-            ax2.pie(availability.values(), labels=availability.keys(), autopct='%1.1f%%', 
-                   colors=['lightgreen', 'lightcoral'], startangle=90)
-            ax2.set_title('Доступность номеров')
-        
-        plt.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.show_report(ROOMS_REPORT)
 
     def show_pricing_stats(self):
         """Показать анализ цен"""
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
-        
-        # Анализ цен по типам номеров
-        prices_by_type = {}
-        
-        for room in self.room_vm.rooms:
-            if room.room_type not in prices_by_type:
-                prices_by_type[room.room_type] = []
-            prices_by_type[room.room_type].append(room.price_per_night)
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        if prices_by_type:
-            types = list(prices_by_type.keys())
-            avg_prices = [sum(prices) / len(prices) for prices in prices_by_type.values()]
-            min_prices = [min(prices) for prices in prices_by_type.values()]
-            max_prices = [max(prices) for prices in prices_by_type.values()]
-            
-            x = range(len(types))
-            width = 0.25
-            
-            ax.bar([i - width for i in x], min_prices, width, label='Мин. цена', color='lightgreen')
-            ax.bar(x, avg_prices, width, label='Средняя цена', color='lightblue')
-            ax.bar([i + width for i in x], max_prices, width, label='Макс. цена', color='lightcoral')
-            
-            ax.set_xlabel('Типы номеров')
-            ax.set_ylabel('Цена (руб.)')
-            ax.set_title('Анализ цен по типам номеров')
-            ax.set_xticks(x)
-            ax.set_xticklabels(types, rotation=45)
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.show_report(PRICING_REPORT)
+
+def create_storage(kind: str = "json", save_delay: float = 0.0):
+    """Создание хранилища данных выбранного типа.
+
+    При save_delay > 0 изменения записываются в фоне сериями раз в save_delay секунд.
+    """
+    # При отложенной записи fsync не нужен: от обрыва защищают атомарная замена и .bak
+    fsync = save_delay <= 0
+    if kind == "journal":
+        from service.journal_service import JournalJSONService
+        storage = JournalJSONService(fsync=fsync)
+    elif kind == "sqlite":
+        from service.sqlite_service import SQLiteService
+        storage = SQLiteService()
+        if storage.needs_migration():
+            # Первый запуск: переносим существующие data/*.json (только один раз)
+            storage.migrate_from_json(JSONService())
+    else:
+        storage = JSONService(fsync=fsync)
+
+    if save_delay > 0:
+        from service.write_behind_service import WriteBehindService
+        storage = WriteBehindService(storage, save_delay)
+    return storage
 
 def main():
-    json_service = JSONService()
-    hotel_vm = HotelViewModel(json_service)
-    room_vm = RoomViewModel(hotel_vm, json_service)
+    parser = argparse.ArgumentParser(description="Система управления отелями")
+    parser.add_argument("--storage", choices=["json", "journal", "sqlite"], default="json",
+                        help="json — перезапись файлов целиком, journal — журнал изменений со снимками, "
+                             "sqlite — база data/hotels.db")
+    parser.add_argument("--save-delay", type=float, default=0.5,
+                        help="задержка фоновой записи изменений в секундах (0 — сохранять сразу)")
+    args = parser.parse_args()
+
+    json_service = create_storage(args.storage, args.save_delay)
+    try:
+        hotel_vm = HotelViewModel(json_service)
+        room_vm = RoomViewModel(hotel_vm, json_service)
 
-    app = CustomMainWindow(hotel_vm, room_vm)
-    app.mainloop()
+        app = CustomMainWindow(hotel_vm, room_vm)
+        app.mainloop()
+    finally:
+        # Гарантированная запись накопленных изменений при выходе
+        json_service.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,8 @@
 class Hotel:
     """Класс, представляющий отель."""
 
+    __slots__ = ("id", "name", "city", "address", "stars", "has_pool")
+
     def __init__(self, id: int, name: str, city: str, address: str, stars: int, has_pool: bool = False):
         self.id = id
         self.name = name
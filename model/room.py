@@ -1,11 +1,18 @@
+import sys
+
+
 class Room:
     """Класс, представляющий номер в отеле."""
 
+    # Без __dict__ у каждого экземпляра: миллион номеров занимает заметно меньше памяти
+    __slots__ = ("id", "hotel_id", "room_number", "room_type", "price_per_night", "is_available")
+
     def __init__(self, id: int, hotel_id: int, room_number: str, room_type: str, price_per_night: float, is_available: bool = True):
         self.id = id
         self.hotel_id = hotel_id
         self.room_number = room_number
-        self.room_type = room_type
+        # Типов номеров немного — храним одну копию каждой строки
+        self.room_type = sys.intern(room_type)
         self.price_per_night = price_per_night
         self.is_available = is_available
 
@@ -0,0 +1,31 @@
+class IdAllocator:
+    """Выдача новых ID по верхней границе (high-water mark) без просмотра записей.
+
+    Граница только растет: ID удаленных записей повторно не выдаются.
+    """
+
+    def __init__(self, last_id: int = 0):
+        self._last_id = last_id
+
+    @property
+    def last_id(self) -> int:
+        """Последний выданный ID"""
+        return self._last_id
+
+    def seed(self, max_id: int):
+        """Поднять границу до уже существующего максимального ID"""
+        if max_id > self._last_id:
+            self._last_id = max_id
+
+    def next_id(self) -> int:
+        """Выдать очередной ID"""
+        self._last_id += 1
+        return self._last_id
+
+    def reserve(self, count: int) -> range:
+        """Зарезервировать непрерывный блок из count ID для пакетной вставки"""
+        if count < 0:
+            raise ValueError("Количество резервируемых ID не может быть отрицательным.")
+        start = self._last_id + 1
+        self._last_id += count
+        return range(start, self._last_id + 1)
@@ -0,0 +1,128 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Type
+
+from service.json_service import JSONService, T
+
+
+class JournalJSONService(JSONService):
+    """Хранилище со снимком в JSON файле и журналом изменений.
+
+    Каждое изменение дописывается строкой в <файл>.journal, поэтому стоимость
+    записи зависит от размера изменения, а не таблицы. После compact_every
+    записей журнал сворачивается в новый снимок. При загрузке снимок
+    дополняется изменениями из журнала.
+
+    Последний выданный ID тоже берется из журнала: это наибольший ID в его
+    записях (или в строке "seq", если ID выдан без записи), поэтому
+    sequences.json переписывается только вместе со снимком.
+    """
+
+    incremental_writes = True
+
+    def __init__(self, data_dir: str = "data", compact_every: int = 1000, streaming: bool = True,
+                 fsync: bool = True, backup: bool = True):
+        super().__init__(data_dir, streaming, fsync, backup)
+        self.compact_every = compact_every
+        self._journal_sizes: Dict[str, int] = {}
+        # Наибольший ID в журнале каждого файла (известен после load_data)
+        self._journal_last_ids: Dict[str, int] = {}
+
+    def _journal_path(self, filename: str) -> Path:
+        return self.data_dir / f"{filename}.journal"
+
+    def load_data(self, filename: str, model_class: Type[T]) -> List[T]:
+        """Загрузка снимка и применение журнала изменений"""
+        journal_path = self._journal_path(filename)
+        if not journal_path.exists():
+            self._journal_sizes[filename] = 0
+            return super().load_data(filename, model_class)
+
+        snapshot = super().load_data(filename, model_class) if (self.data_dir / filename).exists() else []
+        items = {item.id: item for item in snapshot}
+
+        entries = 0
+        corrupted = False
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    if entry["op"] == "put":
+                        item = model_class.from_dict(entry["item"])
+                        items[item.id] = item
+                    elif entry["op"] == "del":
+                        items.pop(entry["id"], None)
+                    self._note_last_id(filename, entry)
+                except (json.JSONDecodeError, KeyError) as e:
+                    # Недописанная строка после сбоя: остальные изменения применены
+                    print(f"Ошибка в журнале {journal_path.name}, строка {line_number}: {e}")
+                    corrupted = True
+                    continue
+                entries += 1
+
+        result = list(items.values())
+        if corrupted:
+            # Сворачиваем сразу, чтобы новые записи не дописывались к испорченной строке
+            self.compact(filename, result)
+        else:
+            self._journal_sizes[filename] = entries
+        return result
+
+    def _note_last_id(self, filename: str, entry: dict):
+        """Учет ID из записи журнала в наибольшем выданном ID"""
+        if entry["op"] == "put":
+            last_id = entry["item"]["id"]
+        else:
+            last_id = entry["last_id"] if entry["op"] == "seq" else entry["id"]
+        self._journal_last_ids[filename] = max(self._journal_last_ids.get(filename, 0), last_id)
+
+    def load_last_id(self, filename: str) -> int:
+        """Последний выданный ID: из sequences.json и журнала (журнал читается в load_data)"""
+        return max(super().load_last_id(filename), self._journal_last_ids.get(filename, 0))
+
+    def save_last_id(self, filename: str, last_id: int):
+        """ID, уже записанный в журнал вместе с изменением, повторно не сохраняется"""
+        if last_id > self.load_last_id(filename):
+            self._append(filename, [{"op": "seq", "last_id": last_id}])
+
+    def save_data(self, filename: str, data: List[T]):
+        """Запись полного снимка и очистка журнала"""
+        super().save_data(filename, data)
+        # Удаленные записи уходят из снимка вместе с их ID, поэтому ID из журнала сохраняется до его удаления
+        super().save_last_id(filename, self.load_last_id(filename))
+        self._journal_path(filename).unlink(missing_ok=True)
+        self._journal_sizes[filename] = 0
+
+    def compact(self, filename: str, data: List[T]):
+        """Свертка журнала в снимок"""
+        self.save_data(filename, data)
+
+    def _append(self, filename: str, entries: List[dict], all_items: List[T] = None):
+        """Дописывание записей в журнал со сверткой при переполнении (если передан all_items)"""
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        try:
+            with open(self._journal_path(filename), 'a', encoding='utf-8') as f:
+                f.write(lines)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+        except Exception as e:
+            print(f"Ошибка записи в журнал {filename}: {e}")
+            raise
+
+        for entry in entries:
+            self._note_last_id(filename, entry)
+        self._journal_sizes[filename] = self._journal_sizes.get(filename, 0) + len(entries)
+        if all_items is not None and self._journal_sizes[filename] >= self.compact_every:
+            self.compact(filename, all_items)
+
+    def save_items(self, filename: str, items: List[T], all_items: List[T]):
+        """Запись добавленных или измененных записей в журнал"""
+        self._append(filename, [{"op": "put", "item": item.to_dict()} for item in items], all_items)
+
+    def delete_items(self, filename: str, ids: List[int], all_items: List[T]):
+        """Запись удаления в журнал"""
+        self._append(filename, [{"op": "del", "id": item_id} for item_id in ids], all_items)
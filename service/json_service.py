@@ -1,14 +1,74 @@
 import json
 import os
-from typing import List, TypeVar, Type
+import shutil
+from typing import Callable, Dict, Iterator, List, TextIO, TypeVar, Type
 from pathlib import Path
 
+from service.json_stream import iter_json_array
+
 T = TypeVar('T')
 
+SEQUENCES_FILE = "sequences.json"
+
+
+def _fsync_dir(dir_path: Path):
+    """Сброс на диск записи каталога после переименования (только POSIX)"""
+    if os.name != "posix":
+        return
+    fd = os.open(dir_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(file_path: Path, write: Callable[[TextIO], None], fsync: bool = True, backup: bool = False):
+    """Атомарная запись файла: временный файл, fsync и переименование поверх старого.
+
+    При backup=True предыдущая версия сохраняется как <файл>.bak.
+    Прерванная запись оставляет нетронутым исходный файл.
+    """
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            write(f)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+
+        if backup and file_path.exists():
+            backup_path = file_path.with_name(file_path.name + ".bak")
+            backup_tmp = backup_path.with_name(backup_path.name + ".tmp")
+            backup_tmp.unlink(missing_ok=True)
+            try:
+                # Жесткая ссылка вместо копирования: предыдущая версия сохраняется бесплатно
+                os.link(file_path, backup_tmp)
+            except OSError:
+                shutil.copyfile(file_path, backup_tmp)
+            os.replace(backup_tmp, backup_path)
+
+        os.replace(tmp_path, file_path)
+        if fsync:
+            _fsync_dir(file_path.parent)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 class JSONService:
-    def __init__(self, data_dir: str = "data"):
+    # Запись отдельных изменений дешевле полной перезаписи файла
+    incremental_writes = False
+
+    def __init__(self, data_dir: str = "data", streaming: bool = True, fsync: bool = True, backup: bool = True):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
+        # Поэлементный разбор файлов вместо json.load всего массива
+        self.streaming = streaming
+        # fsync перед переименованием; можно отключить, если запись все равно отложенная
+        self.fsync = fsync
+        # Хранить предыдущую версию каждого файла как <файл>.bak
+        self.backup = backup
+        self._sequences: Dict[str, int] = None
 
     def load_data(self, filename: str, model_class: Type[T]) -> List[T]:
         """Загрузка данных из JSON файла"""
@@ -20,13 +80,43 @@ class JSONService:
             return []
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [model_class.from_dict(item) for item in data]
-        except (json.JSONDecodeError, KeyError) as e:
+            return self._read_data(filename, model_class)
+        except (json.JSONDecodeError, KeyError, UnicodeDecodeError) as e:
             print(f"Ошибка загрузки данных из {filename}: {e}")
+
+        # Поврежденный файл откладываем в любом случае: иначе следующее сохранение
+        # затрет его, а при backup=True еще и заменит им резервную копию
+        corrupt_path = file_path.with_name(file_path.name + ".corrupt")
+        os.replace(file_path, corrupt_path)
+        print(f"Поврежденный файл {filename} сохранен как {corrupt_path.name}")
+
+        # Восстанавливаем последнюю исправную копию
+        backup_path = file_path.with_name(file_path.name + ".bak")
+        if not backup_path.exists():
+            return []
+        try:
+            items = self._read_data(backup_path.name, model_class)
+        except (json.JSONDecodeError, KeyError, UnicodeDecodeError) as e:
+            print(f"Ошибка загрузки резервной копии {backup_path.name}: {e}")
             return []
 
+        print(f"Данные {filename} восстановлены из {backup_path.name}")
+        shutil.copyfile(backup_path, file_path)
+        return items
+
+    def _read_data(self, filename: str, model_class: Type[T]) -> List[T]:
+        if self.streaming:
+            return list(self.iter_data(filename, model_class))
+        with open(self.data_dir / filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+            return [model_class.from_dict(item) for item in data]
+
+    def iter_data(self, filename: str, model_class: Type[T]) -> Iterator[T]:
+        """Поочередная загрузка объектов из JSON файла без чтения всего массива в память"""
+        with open(self.data_dir / filename, 'r', encoding='utf-8') as f:
+            for item in iter_json_array(f):
+                yield model_class.from_dict(item)
+
     def save_data(self, filename: str, data: List[T]):
         """Сохранение данных в JSON файл"""
         file_path = self.data_dir / filename
@@ -35,8 +125,80 @@ class JSONService:
             # Преобразуем объекты в словари
             data_dicts = [item.to_dict() for item in data]
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data_dicts, f, ensure_ascii=False, indent=2)
+            atomic_write(file_path, lambda f: json.dump(data_dicts, f, ensure_ascii=False, indent=2),
+                         fsync=self.fsync, backup=self.backup)
         except Exception as e:
             print(f"Ошибка сохранения данных в {filename}: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def save_items(self, filename: str, items: List[T], all_items: List[T]):
+        """Сохранение добавленных или измененных записей.
+
+        JSON файл переписывается целиком; хранилища с журналом или БД
+        переопределяют метод и записывают только items.
+        """
+        self.save_data(filename, all_items)
+
+    def delete_items(self, filename: str, ids: List[int], all_items: List[T]):
+        """Сохранение удаления записей с указанными ID (all_items — уже без них)"""
+        self.save_data(filename, all_items)
+
+    def flush(self):
+        """Все изменения записываются сразу — ждать нечего"""
+
+    def close(self):
+        """Освобождение ресурсов хранилища"""
+
+    def _load_sequences(self) -> Dict[str, int]:
+        """Загрузка последних выданных ID для всех файлов данных"""
+        if self._sequences is None:
+            file_path = self.data_dir / SEQUENCES_FILE
+            self._sequences = {}
+            if file_path.exists():
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        self._sequences = {name: int(value) for name, value in json.load(f).items()}
+                except (json.JSONDecodeError, ValueError, AttributeError) as e:
+                    print(f"Ошибка загрузки данных из {SEQUENCES_FILE}: {e}")
+        return self._sequences
+
+    def load_last_id(self, filename: str) -> int:
+        """Последний выданный ID для файла данных (0, если не сохранялся)"""
+        return self._load_sequences().get(filename, 0)
+
+    def save_last_id(self, filename: str, last_id: int):
+        """Сохранение последнего выданного ID для файла данных"""
+        sequences = self._load_sequences()
+        if sequences.get(filename) == last_id:
+            return
+        sequences[filename] = last_id
+
+        file_path = self.data_dir / SEQUENCES_FILE
+        try:
+            atomic_write(file_path, lambda f: json.dump(sequences, f, ensure_ascii=False, indent=2),
+                         fsync=self.fsync)
+        except Exception as e:
+            print(f"Ошибка сохранения данных в {SEQUENCES_FILE}: {e}")
+            raise
+
+
+class ReadOnlyJSONService(JSONService):
+    """Чтение данных JSON без каких-либо изменений каталога.
+
+    Для пакетных отчетов по рабочим данным: отсутствующий или поврежденный
+    файл — ошибка, а не повод создать пустой файл, отложить поврежденный
+    или восстановить .bak.
+    """
+
+    def load_data(self, filename: str, model_class: Type[T]) -> List[T]:
+        try:
+            return self._read_data(filename, model_class)
+        except (OSError, json.JSONDecodeError, KeyError, UnicodeDecodeError) as e:
+            print(f"Ошибка загрузки данных из {filename}: {e}")
+            raise
+
+    def save_data(self, filename: str, data: List[T]):
+        raise RuntimeError("Хранилище открыто только для чтения.")
+
+    def save_last_id(self, filename: str, last_id: int):
+        raise RuntimeError("Хранилище открыто только для чтения.")
@@ -0,0 +1,80 @@
+import json
+from typing import Iterator, TextIO
+
+WHITESPACE = " \t\n\r"
+
+
+def _followed_by_separator(buffer: str, pos: int) -> bool:
+    while pos < len(buffer) and buffer[pos] in WHITESPACE:
+        pos += 1
+    return pos < len(buffer) and buffer[pos] in ",]"
+
+
+def iter_json_array(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[object]:
+    """Поэлементный разбор JSON массива из файла.
+
+    В памяти одновременно находятся только текущий блок текста и один
+    разобранный элемент, а не весь список словарей.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def read_more() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace() -> str:
+        """Пропуск пробелов; возвращает следующий символ или '' в конце файла"""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not read_more():
+                return ""
+
+    if skip_whitespace() != "[":
+        raise json.JSONDecodeError("Ожидался JSON массив", buffer, pos)
+    pos += 1
+
+    if skip_whitespace() == "]":
+        pos += 1
+    else:
+        while True:
+            skip_whitespace()
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Элемент оборван на границе блока — дочитываем
+                    if read_more():
+                        continue
+                    raise
+                # Число на границе блока могло быть прочитано не полностью:
+                # элемент считается завершенным, только если за ним виден разделитель
+                if not _followed_by_separator(buffer, end) and read_more():
+                    continue
+                break
+            pos = end
+            yield item
+
+            separator = skip_whitespace()
+            pos += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                raise json.JSONDecodeError("Ожидалась ',' или ']'", buffer, pos - 1)
+
+    if skip_whitespace():
+        raise json.JSONDecodeError("Лишние данные после JSON массива", buffer, pos)
@@ -0,0 +1,183 @@
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Type
+
+from model.hotel import Hotel
+from model.room import Room
+from service.json_service import JSONService, T
+
+# Схема таблиц: файл данных → (таблица, модель, колонки, логические колонки)
+TABLES = {
+    "hotels.json": ("hotels", Hotel, [
+        ("id", "INTEGER PRIMARY KEY"),
+        ("name", "TEXT NOT NULL"),
+        ("city", "TEXT NOT NULL"),
+        ("address", "TEXT NOT NULL"),
+        ("stars", "INTEGER NOT NULL"),
+        ("has_pool", "INTEGER NOT NULL"),
+    ], {"has_pool"}),
+    "rooms.json": ("rooms", Room, [
+        ("id", "INTEGER PRIMARY KEY"),
+        ("hotel_id", "INTEGER NOT NULL"),
+        ("room_number", "TEXT NOT NULL"),
+        ("room_type", "TEXT NOT NULL"),
+        ("price_per_night", "REAL NOT NULL"),
+        ("is_available", "INTEGER NOT NULL"),
+    ], {"is_available"}),
+}
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_hotels_city ON hotels (city)",
+    "CREATE INDEX IF NOT EXISTS idx_rooms_hotel_id ON rooms (hotel_id)",
+    "CREATE INDEX IF NOT EXISTS idx_rooms_hotel_room_number ON rooms (hotel_id, room_number)",
+]
+
+# Ключ в таблице meta: перенос из JSON уже выполнен
+MIGRATED_FROM_JSON = "migrated_from_json"
+
+
+class SQLiteService:
+    """Хранилище отелей и номеров в локальной базе SQLite с интерфейсом JSONService.
+
+    Изменения одной записи выполняются одним оператором, без перезаписи всей таблицы.
+    """
+
+    incremental_writes = True
+
+    def __init__(self, db_path: str = "data/hotels.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Соединение может использоваться потоком отложенной записи (WriteBehindService)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # Последние записанные значения sequences: неизменный ID не пишется повторно
+        self._last_ids: Dict[str, int] = {}
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._conn:
+            for table, _, columns, _ in TABLES.values():
+                columns_sql = ", ".join(f"{name} {definition}" for name, definition in columns)
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns_sql})")
+            for statement in INDEXES:
+                self._conn.execute(statement)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sequences (filename TEXT PRIMARY KEY, last_id INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    @staticmethod
+    def _table(filename: str):
+        if filename not in TABLES:
+            raise ValueError(f"Неизвестный файл данных: {filename}")
+        return TABLES[filename]
+
+    def _row_to_dict(self, filename: str, row) -> dict:
+        _, _, columns, bool_columns = self._table(filename)
+        data = dict(zip((name for name, _ in columns), row))
+        for name in bool_columns:
+            data[name] = bool(data[name])
+        return data
+
+    def _item_to_row(self, filename: str, item) -> tuple:
+        _, _, columns, _ = self._table(filename)
+        data = item.to_dict()
+        return tuple(data[name] for name, _ in columns)
+
+    def _insert_sql(self, filename: str) -> str:
+        table, _, columns, _ = self._table(filename)
+        names = ", ".join(name for name, _ in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        return f"INSERT OR REPLACE INTO {table} ({names}) VALUES ({placeholders})"
+
+    def is_empty(self) -> bool:
+        """Нет ни одного отеля и номера"""
+        return all(
+            self._conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None
+            for table, _, _, _ in TABLES.values()
+        )
+
+    def needs_migration(self) -> bool:
+        """Перенос из JSON еще не выполнялся.
+
+        Пустая база, в которую уже что-то записывали (есть выданные ID), —
+        это удаленные пользователем данные, а не новая база.
+        """
+        if self._conn.execute("SELECT 1 FROM meta WHERE key = ?", (MIGRATED_FROM_JSON,)).fetchone():
+            return False
+        has_sequences = self._conn.execute("SELECT 1 FROM sequences LIMIT 1").fetchone() is not None
+        return self.is_empty() and not has_sequences
+
+    def load_data(self, filename: str, model_class: Type[T]) -> List[T]:
+        """Загрузка всех записей таблицы"""
+        table, _, columns, _ = self._table(filename)
+        names = ", ".join(name for name, _ in columns)
+        cursor = self._conn.execute(f"SELECT {names} FROM {table} ORDER BY id")
+        return [model_class.from_dict(self._row_to_dict(filename, row)) for row in cursor]
+
+    def save_data(self, filename: str, data: List[T]):
+        """Замена всего содержимого таблицы"""
+        table, _, _, _ = self._table(filename)
+        try:
+            with self._conn:
+                self._conn.execute(f"DELETE FROM {table}")
+                self._conn.executemany(self._insert_sql(filename),
+                                       (self._item_to_row(filename, item) for item in data))
+        except sqlite3.Error as e:
+            print(f"Ошибка сохранения данных в {table}: {e}")
+            raise
+
+    def save_items(self, filename: str, items: List[T], all_items: List[T]):
+        """Вставка или обновление только переданных записей"""
+        try:
+            with self._conn:
+                self._conn.executemany(self._insert_sql(filename),
+                                       (self._item_to_row(filename, item) for item in items))
+        except sqlite3.Error as e:
+            print(f"Ошибка сохранения данных в {filename}: {e}")
+            raise
+
+    def delete_items(self, filename: str, ids: List[int], all_items: List[T]):
+        """Удаление записей с указанными ID"""
+        table, _, _, _ = self._table(filename)
+        try:
+            with self._conn:
+                self._conn.executemany(f"DELETE FROM {table} WHERE id = ?", ((item_id,) for item_id in ids))
+        except sqlite3.Error as e:
+            print(f"Ошибка удаления данных из {table}: {e}")
+            raise
+
+    def load_last_id(self, filename: str) -> int:
+        """Последний выданный ID для файла данных (0, если не сохранялся)"""
+        if filename not in self._last_ids:
+            row = self._conn.execute("SELECT last_id FROM sequences WHERE filename = ?", (filename,)).fetchone()
+            self._last_ids[filename] = row[0] if row else 0
+        return self._last_ids[filename]
+
+    def save_last_id(self, filename: str, last_id: int):
+        """Сохранение последнего выданного ID для файла данных"""
+        if self._last_ids.get(filename) == last_id:
+            return
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO sequences (filename, last_id) VALUES (?, ?)",
+                               (filename, last_id))
+        self._last_ids[filename] = last_id
+
+    def migrate_from_json(self, json_service: JSONService) -> Dict[str, int]:
+        """Однократный перенос данных из JSON файлов в базу"""
+        counts: Dict[str, int] = {}
+        for filename, (_, model_class, _, _) in TABLES.items():
+            items = json_service.load_data(filename, model_class)
+            self.save_data(filename, items)
+            last_id = max(json_service.load_last_id(filename),
+                          max((item.id for item in items), default=0))
+            self.save_last_id(filename, last_id)
+            counts[filename] = len(items)
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (MIGRATED_FROM_JSON, "1"))
+        return counts
+
+    def flush(self):
+        """Каждое изменение фиксируется своей транзакцией — ждать нечего"""
+
+    def close(self):
+        self._conn.close()
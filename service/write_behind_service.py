@@ -0,0 +1,264 @@
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+from service.json_service import T
+
+
+class _Record:
+    """Запись в том виде, в каком ее получает хранилище: только to_dict() и id"""
+
+    __slots__ = ("id", "_data")
+
+    def __init__(self, data: dict):
+        self.id = data["id"]
+        self._data = data
+
+    def to_dict(self) -> dict:
+        return self._data
+
+
+class _Records(Sequence):
+    """Список записей поверх кортежей снимка; _Record создается только при чтении"""
+
+    def __init__(self, fields: Tuple[str, ...], rows: List[tuple]):
+        self._fields = fields
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index: int) -> _Record:
+        return _Record(dict(zip(self._fields, self._rows[index])))
+
+
+class _Snapshot:
+    """Копия записей одного файла, которую обновляет основной поток.
+
+    Каждая запись хранится неизменяемым кортежем значений to_dict(), поэтому
+    фоновый поток не читает объекты модели, которые в это время может менять
+    основной поток. Изменение записи стоит одного to_dict(), а не всего файла.
+    """
+
+    def __init__(self, items: List[T]):
+        self.fields: Tuple[str, ...] = ()
+        self.rows: Dict[int, tuple] = {}
+        self.reset(items)
+
+    def _row(self, item) -> tuple:
+        data = item.to_dict()
+        if not self.fields:
+            self.fields = tuple(data)
+        return tuple(data.values())
+
+    def reset(self, items: List[T]):
+        self.rows = {item.id: self._row(item) for item in items}
+
+    def put(self, items: List[T]) -> Dict[int, tuple]:
+        rows = {item.id: self._row(item) for item in items}
+        self.rows.update(rows)
+        return rows
+
+    def remove(self, ids: List[int]):
+        for item_id in ids:
+            self.rows.pop(item_id, None)
+
+
+class _PendingFile:
+    """Несохраненные изменения одного файла данных"""
+
+    def __init__(self):
+        # Нужна полная перезапись файла из снимка
+        self.full = False
+        # ID → кортеж записи для сохранения или None для удаления; последнее изменение побеждает
+        self.changes: Dict[int, Optional[tuple]] = {}
+
+    def merge_older(self, older: "_PendingFile"):
+        """Вернуть в очередь изменения, которые не удалось записать"""
+        if self.full:
+            return
+        if older.full:
+            self.full = True
+            self.changes.clear()
+            return
+        merged = dict(older.changes)
+        merged.update(self.changes)
+        self.changes = merged
+
+
+class WriteBehindService:
+    """Отложенная запись поверх любого хранилища с интерфейсом JSONService.
+
+    Изменения помечают хранилище «грязным», а фоновый поток через delay
+    секунд записывает всю накопленную серию одним сохранением. flush()
+    записывает все немедленно, close() — записывает и останавливает поток.
+    Записи копируются в снимок при вызове save_*/delete_* в потоке
+    вызывающего, фоновый поток пишет только эти копии.
+    """
+
+    def __init__(self, storage, delay: float = 0.5):
+        self.storage = storage
+        self.delay = delay
+        # Хранилище умеет записывать отдельные записи (журнал, SQLite), а не только весь файл
+        self._incremental = getattr(storage, "incremental_writes", False)
+        self._pending: Dict[str, _PendingFile] = {}
+        self._snapshots: Dict[str, _Snapshot] = {}
+        self._pending_last_ids: Dict[str, int] = {}
+        self._due: Optional[float] = None
+        self._closed = False
+        self._cond = threading.Condition()
+        # Сериализует записи фонового потока и явные flush()/загрузки
+        self._write_lock = threading.RLock()
+        self._worker = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._worker.start()
+
+    def __getattr__(self, name):
+        # Остальные методы хранилища (is_empty, migrate_from_json, ...) — без изменений
+        return getattr(self.storage, name)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and self._due is None:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                remaining = self._due - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+            try:
+                self.flush()
+            except Exception:
+                # Ошибка уже выведена хранилищем; изменения остались в очереди до следующей попытки
+                with self._cond:
+                    if self._due is None:
+                        self._due = time.monotonic() + self.delay
+
+    def _mark_dirty(self):
+        if self._closed:
+            raise RuntimeError("Хранилище закрыто.")
+        if self._due is None:
+            self._due = time.monotonic() + self.delay
+            self._cond.notify()
+
+    def _file(self, filename: str) -> _PendingFile:
+        pending = self._pending.get(filename)
+        if pending is None:
+            pending = self._pending[filename] = _PendingFile()
+        return pending
+
+    def _snapshot(self, filename: str, all_items: List[T]) -> _Snapshot:
+        snapshot = self._snapshots.get(filename)
+        if snapshot is None:
+            snapshot = self._snapshots[filename] = _Snapshot(all_items)
+        return snapshot
+
+    def _check_snapshot(self, filename: str, all_items: List[T]):
+        """Снимок разошелся с полным списком (изменение прошло мимо) — строим заново"""
+        snapshot = self._snapshots[filename]
+        if len(snapshot.rows) != len(all_items):
+            snapshot.reset(all_items)
+            self._file(filename).full = True
+
+    def load_data(self, filename: str, model_class: Type[T]) -> List[T]:
+        with self._write_lock:
+            self.flush()
+            with self._cond:
+                # Снимок строится заново по загруженным записям при следующем изменении
+                if filename not in self._pending:
+                    self._snapshots.pop(filename, None)
+            return self.storage.load_data(filename, model_class)
+
+    def save_data(self, filename: str, data: List[T]):
+        with self._cond:
+            self._snapshots[filename] = _Snapshot(data)
+            pending = self._file(filename)
+            pending.full = True
+            pending.changes.clear()
+            self._mark_dirty()
+
+    def save_items(self, filename: str, items: List[T], all_items: List[T]):
+        with self._cond:
+            rows = self._snapshot(filename, all_items).put(items)
+            pending = self._file(filename)
+            if not self._incremental:
+                pending.full = True
+            elif not pending.full:
+                for item_id, row in rows.items():
+                    pending.changes.pop(item_id, None)
+                    pending.changes[item_id] = row
+            self._check_snapshot(filename, all_items)
+            self._mark_dirty()
+
+    def delete_items(self, filename: str, ids: List[int], all_items: List[T]):
+        with self._cond:
+            self._snapshot(filename, all_items).remove(ids)
+            pending = self._file(filename)
+            if not self._incremental:
+                pending.full = True
+            elif not pending.full:
+                for item_id in ids:
+                    pending.changes.pop(item_id, None)
+                    pending.changes[item_id] = None
+            self._check_snapshot(filename, all_items)
+            self._mark_dirty()
+
+    def load_last_id(self, filename: str) -> int:
+        with self._cond:
+            if filename in self._pending_last_ids:
+                return self._pending_last_ids[filename]
+        return self.storage.load_last_id(filename)
+
+    def save_last_id(self, filename: str, last_id: int):
+        with self._cond:
+            self._pending_last_ids[filename] = last_id
+            self._mark_dirty()
+
+    def flush(self):
+        """Немедленная запись всех накопленных изменений"""
+        with self._write_lock:
+            with self._cond:
+                pending, self._pending = self._pending, {}
+                last_ids, self._pending_last_ids = self._pending_last_ids, {}
+                self._due = None
+                # Копия ссылок на кортежи: основной поток может продолжать обновлять снимок
+                snapshots = {filename: (self._snapshots[filename].fields, list(self._snapshots[filename].rows.values()))
+                             for filename in pending}
+
+            written = []
+            try:
+                for filename, changes in pending.items():
+                    self._write(filename, changes, *snapshots[filename])
+                    written.append(filename)
+                for filename, last_id in last_ids.items():
+                    self.storage.save_last_id(filename, last_id)
+            except Exception:
+                with self._cond:
+                    for filename, changes in pending.items():
+                        if filename not in written:
+                            self._file(filename).merge_older(changes)
+                    for filename, last_id in last_ids.items():
+                        self._pending_last_ids.setdefault(filename, last_id)
+                raise
+
+    def _write(self, filename: str, pending: _PendingFile, fields: Tuple[str, ...], rows: List[tuple]):
+        all_records = _Records(fields, rows)
+        if pending.full:
+            self.storage.save_data(filename, all_records)
+            return
+        saved = _Records(fields, [row for row in pending.changes.values() if row is not None])
+        deleted = [item_id for item_id, row in pending.changes.items() if row is None]
+        if saved:
+            self.storage.save_items(filename, saved, all_records)
+        if deleted:
+            self.storage.delete_items(filename, deleted, all_records)
+
+    def close(self):
+        """Запись накопленных изменений и остановка фонового потока"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._worker.join()
+        self.flush()
+        self.storage.close()
@@ -1,6 +1,8 @@
 import customtkinter as ctk
 from tkinter import ttk, messagebox
 from view.new_hotel_window import NewHotelWindow
+from view.incremental_search import IncrementalSearch
+from view.virtual_table import VirtualTable
 
 class CustomHotelWindow(ctk.CTkToplevel):
     def __init__(self, parent, view_model):
@@ -12,6 +14,16 @@ class CustomHotelWindow(ctk.CTkToplevel):
         self.create_interface()
         self.refresh_table()
 
+        # Построчное обновление таблицы по событиям viewmodel
+        self._unsubscribe = self.vm.subscribe(self.on_hotels_changed)
+        self.bind("<Destroy>", self.on_destroy)
+
+    def on_destroy(self, event):
+        """Отписка от событий и отмена поиска при закрытии окна"""
+        if event.widget is self:
+            self._unsubscribe()
+            self.search.cancel()
+
     def create_interface(self):
         """Создание интерфейса управления отелями"""
         # Основной контейнер
@@ -93,21 +105,21 @@ class CustomHotelWindow(ctk.CTkToplevel):
             search_right,
             values=["Все звезды", "5 звезд", "4 звезды", "3 звезды", "2 звезды", "1 звезда"],
             width=120,
-            height=35
+            height=35,
+            command=self.on_filter_changed
         )
         self.stars_filter.pack(side="left", padx=(0, 10))
         self.stars_filter.set("Все звезды")
-        self.stars_filter.bind("<<ComboboxSelected>>", self.on_search)
         
         self.pool_filter = ctk.CTkComboBox(
             search_right,
             values=["Все", "С бассейном", "Без бассейна"],
             width=130,
-            height=35
+            height=35,
+            command=self.on_filter_changed
         )
         self.pool_filter.pack(side="left")
         self.pool_filter.set("Все")
-        self.pool_filter.bind("<<ComboboxSelected>>", self.on_search)
 
     def create_table(self, parent):
         """Создание таблицы"""
@@ -132,8 +144,10 @@ class CustomHotelWindow(ctk.CTkToplevel):
                        font=('TkDefaultFont', 12, 'bold'))
         style.map('Hotel.Treeview', background=[('selected', '#1f6aa5')])
         
-        self.tree = ttk.Treeview(self.tree_frame, columns=columns, show="headings", 
-                               style="Hotel.Treeview", height=15)
+        # Виртуальная таблица: Tk-строки создаются только для видимого окна
+        self.table = VirtualTable(self.tree_frame, columns,
+                                  lambda hotel_id: self.hotel_row_values(self.vm.get_hotel_by_id(hotel_id)),
+                                  style="Hotel.Treeview", height=15)
         
         # Настройка колонок
         column_config = {
@@ -142,15 +156,22 @@ class CustomHotelWindow(ctk.CTkToplevel):
         }
         
         for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=column_config[col])
-        
-        # Скроллбар
-        scrollbar = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+            self.table.heading(col, text=col)
+            self.table.column(col, width=column_config[col])
+
+        # Сортировка по щелчку на заголовке берется из упорядоченных индексов viewmodel
+        sort_fields = {
+            "ID": "id", "Название": "name", "Город": "city",
+            "Адрес": "address", "Звезды": "stars", "Бассейн": "has_pool"
+        }
+        for col, field in sort_fields.items():
+            self.table.make_sortable(col, self.vm.hotel_sort_key(field),
+                                     lambda ids, reverse, field=field: self.vm.sort_hotels(ids, field, reverse))
         
-        self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.table.tree.pack(side="left", fill="both", expand=True)
+        self.table.scrollbar.pack(side="right", fill="y")
+        self.search = IncrementalSearch(self, self.table, lambda: self.vm.hotels, self.vm.get_hotel_by_id,
+                                        lambda filters: self.vm.search_hotels(filters[0]) if filters[0] else None)
 
     def adjust_color(self, color, amount):
         """Регулировка яркости цвета"""
@@ -164,48 +185,59 @@ class CustomHotelWindow(ctk.CTkToplevel):
 
     def on_search(self, event=None):
         """Обработка поиска и фильтрации"""
+        self.refresh_table(debounce=True)
+
+    def on_filter_changed(self, choice=None):
+        """Смена фильтра звезд или бассейна: таблица обновляется сразу"""
         self.refresh_table()
 
-    def refresh_table(self):
-        """Обновление таблицы"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def current_filters(self):
+        """Текущие значения поиска и фильтров"""
+        return self.search_entry.get().lower(), self.stars_filter.get(), self.pool_filter.get()
+
+    def hotel_matches(self, hotel, filters):
+        """Подходит ли отель под поиск и фильтры"""
+        search_term, stars_filter, pool_filter = filters
+        
+        # Поиск
+        if search_term and (search_term not in hotel.name.lower() and 
+                          search_term not in hotel.city.lower() and
+                          search_term not in hotel.address.lower()):
+            return False
         
-        search_term = self.search_entry.get().lower()
-        stars_filter = self.stars_filter.get()
-        pool_filter = self.pool_filter.get()
+        # Фильтр по звездам
+        if stars_filter != "Все звезды":
+            required_stars = int(stars_filter[0])
+            if hotel.stars != required_stars:
+                return False
         
-        for hotel in self.vm.hotels:
-            # Поиск
-            if search_term and (search_term not in hotel.name.lower() and 
-                              search_term not in hotel.city.lower() and
-                              search_term not in hotel.address.lower()):
-                continue
-            
-            # Фильтр по звездам
-            if stars_filter != "Все звезды":
-                required_stars = int(stars_filter[0])
-                if hotel.stars != required_stars:
-                    continue
-            
-            # Фильтр по бассейну
-            if pool_filter == "С бассейном" and not hotel.has_pool:
-                continue
-            if pool_filter == "Без бассейна" and hotel.has_pool:
-                continue
-            
-            pool = "✅ Есть" if hotel.has_pool else "❌ Нет"
-            stars_display = "⭐" * hotel.stars
-            
-            self.tree.insert("", "end", values=(
-                hotel.id, hotel.name, hotel.city, hotel.address, 
-                stars_display, pool
-            ))
+        # Фильтр по бассейну
+        if pool_filter == "С бассейном" and not hotel.has_pool:
+            return False
+        if pool_filter == "Без бассейна" and hotel.has_pool:
+            return False
+        return True
+
+    def hotel_row_values(self, hotel):
+        """Значения строки таблицы"""
+        pool = "✅ Есть" if hotel.has_pool else "❌ Нет"
+        stars_display = "⭐" * hotel.stars
+        return (hotel.id, hotel.name, hotel.city, hotel.address, stars_display, pool)
+
+    def refresh_table(self, debounce: bool = False):
+        """Обновление таблицы; debounce — отложенный поиск при вводе"""
+        filters = self.current_filters()
+        self.search.search(filters, lambda hotel: self.hotel_matches(hotel, filters),
+                           delay=None if debounce else 0, narrow=debounce)
+
+    def on_hotels_changed(self, event):
+        """Построчное обновление таблицы после изменения отелей"""
+        filters = self.current_filters()
+        self.search.apply_change_event(event, lambda hotel: self.hotel_matches(hotel, filters))
 
     def get_selected_id(self):
         """Получить ID выбранного отеля"""
-        selection = self.tree.selection()
-        return int(self.tree.item(selection[0])["values"][0]) if selection else None
+        return self.table.get_selected_id()
 
     def add_hotel(self):
         """Добавить отель"""
@@ -220,7 +252,6 @@ class CustomHotelWindow(ctk.CTkToplevel):
                     stars=dialog.result["stars"],
                     has_pool=dialog.result["has_pool"]
                 )
-                self.refresh_table()
             except ValueError as e:
                 messagebox.showerror("Ошибка", str(e))
 
@@ -252,7 +283,6 @@ class CustomHotelWindow(ctk.CTkToplevel):
                     stars=dialog.result["stars"],
                     has_pool=dialog.result["has_pool"]
                 )
-                self.refresh_table()
         except ValueError as e:
             messagebox.showerror("Ошибка", str(e))
 
@@ -266,6 +296,5 @@ class CustomHotelWindow(ctk.CTkToplevel):
         if messagebox.askyesno("Подтверждение", "Удалить выбранный отель?"):
             try:
                 self.vm.delete_hotel(hotel_id)
-                self.refresh_table()
             except ValueError as e:
                 messagebox.showerror("Ошибка", str(e))
\ No newline at end of file
@@ -1,6 +1,9 @@
 import customtkinter as ctk
 from tkinter import ttk, messagebox
 from view.new_room_window import NewRoomWindow
+from view.incremental_search import IncrementalSearch
+from view.virtual_table import VirtualTable
+from viewmodel.events import ChangeEvent, ADDED, REMOVED, UPDATED
 
 class CustomRoomWindow(ctk.CTkToplevel):
     def __init__(self, parent, room_vm, hotel_vm):
@@ -13,6 +16,21 @@ class CustomRoomWindow(ctk.CTkToplevel):
         self.create_interface()
         self.refresh_table()
 
+        # Построчное обновление таблицы по событиям viewmodel
+        self._unsubscribers = [
+            self.room_vm.subscribe(self.on_rooms_changed),
+            self.hotel_vm.subscribe(self.on_hotels_changed),
+        ]
+        self.bind("<Destroy>", self.on_destroy)
+
+    def on_destroy(self, event):
+        """Отписка от событий и отмена поиска при закрытии окна"""
+        if event.widget is self:
+            for unsubscribe in self._unsubscribers:
+                unsubscribe()
+            self._unsubscribers = []
+            self.search.cancel()
+
     def create_interface(self):
         """Создание интерфейса управления номерами"""
         # Основной контейнер
@@ -91,39 +109,41 @@ class CustomRoomWindow(ctk.CTkToplevel):
             font=ctk.CTkFont(weight="bold")
         ).pack(side="left", padx=(0, 10))
         
+        # Подпись варианта фильтра → значение поля (None — без фильтра)
+        self._hotel_options = {}
+        self._status_options = {}
+        self._type_options = {}
+        # Поле → значение → число номеров при остальных выбранных фильтрах; подписи отелей
+        self._filter_counts = {}
+        self._hotel_texts = []
+
         # Фильтр по отелю
-        hotel_names = ["Все отели"] + [f"{hotel.name} ({hotel.city})" for hotel in self.hotel_vm.hotels]
         self.hotel_filter = ctk.CTkComboBox(
             search_right,
-            values=hotel_names,
-            width=180,
-            height=35
+            width=200,
+            height=35,
+            command=self.on_filter_changed
         )
         self.hotel_filter.pack(side="left", padx=(0, 10))
-        self.hotel_filter.set("Все отели")
-        self.hotel_filter.bind("<<ComboboxSelected>>", self.on_search)
         
         # Фильтр по статусу
         self.status_filter = ctk.CTkComboBox(
             search_right,
-            values=["Все", "Доступны", "Заняты"],
-            width=120,
-            height=35
+            width=150,
+            height=35,
+            command=self.on_filter_changed
         )
         self.status_filter.pack(side="left", padx=(0, 10))
-        self.status_filter.set("Все")
-        self.status_filter.bind("<<ComboboxSelected>>", self.on_search)
         
         # Фильтр по типу номера
         self.type_filter = ctk.CTkComboBox(
             search_right,
-            values=["Все типы", "Стандарт", "Бизнес", "Люкс", "Премиум", "Семейный"],
-            width=130,
-            height=35
+            width=160,
+            height=35,
+            command=self.on_filter_changed
         )
         self.type_filter.pack(side="left")
-        self.type_filter.set("Все типы")
-        self.type_filter.bind("<<ComboboxSelected>>", self.on_search)
+        self.update_filter_options()
 
     def create_table(self, parent):
         """Создание таблицы"""
@@ -148,8 +168,10 @@ class CustomRoomWindow(ctk.CTkToplevel):
                        font=('TkDefaultFont', 12, 'bold'))
         style.map('Room.Treeview', background=[('selected', '#1f6aa5')])
         
-        self.tree = ttk.Treeview(self.tree_frame, columns=columns, show="headings", 
-                               style="Room.Treeview", height=16)
+        # Виртуальная таблица: Tk-строки создаются только для видимого окна
+        self.table = VirtualTable(self.tree_frame, columns,
+                                  lambda room_id: self.room_row_values(self.room_vm.get_room_by_id(room_id)),
+                                  style="Room.Treeview", height=16)
         
         # Настройка колонок
         column_config = {
@@ -158,15 +180,22 @@ class CustomRoomWindow(ctk.CTkToplevel):
         }
         
         for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=column_config[col])
-        
-        # Скроллбар
-        scrollbar = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+            self.table.heading(col, text=col)
+            self.table.column(col, width=column_config[col])
+
+        # Сортировка по щелчку на заголовке берется из упорядоченных индексов viewmodel
+        sort_fields = {
+            "ID": "id", "Отель": "hotel", "Номер": "room_number",
+            "Тип": "room_type", "Цена за ночь": "price_per_night", "Статус": "is_available"
+        }
+        for col, field in sort_fields.items():
+            self.table.make_sortable(col, self.room_vm.room_sort_key(field),
+                                     lambda ids, reverse, field=field: self.room_vm.sort_rooms(ids, field, reverse))
+        
+        self.table.tree.pack(side="left", fill="both", expand=True)
+        self.table.scrollbar.pack(side="right", fill="y")
+        self.search = IncrementalSearch(self, self.table, lambda: self.room_vm.rooms, self.room_vm.get_room_by_id,
+                                        self.lookup_rooms)
 
     def adjust_color(self, color, amount):
         """Регулировка яркости цвета"""
@@ -180,55 +209,168 @@ class CustomRoomWindow(ctk.CTkToplevel):
 
     def on_search(self, event=None):
         """Обработка поиска и фильтрации"""
+        self.refresh_table(debounce=True)
+
+    def on_filter_changed(self, choice=None):
+        """Смена фильтра: пересчет числа номеров в подписях и обновление таблицы"""
+        self.update_filter_options()
         self.refresh_table()
 
-    def refresh_table(self):
-        """Обновление таблицы"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        search_term = self.search_entry.get().lower()
-        hotel_filter = self.hotel_filter.get()
-        status_filter = self.status_filter.get()
-        type_filter = self.type_filter.get()
-        
-        # Создаем словарь для быстрого доступа к отелям
-        hotel_map = {hotel.id: f"{hotel.name} ({hotel.city})" for hotel in self.hotel_vm.hotels}
-        
-        for room in self.room_vm.rooms:
-            hotel_name = hotel_map.get(room.hotel_id, "Неизвестно")
-            
-            # Поиск
-            if search_term and (search_term not in room.room_number.lower() and 
-                              search_term not in room.room_type.lower() and
-                              search_term not in hotel_name.lower()):
-                continue
-            
-            # Фильтр по отелю
-            if hotel_filter != "Все отели" and hotel_name != hotel_filter:
-                continue
-            
-            # Фильтр по статусу
-            if status_filter == "Доступны" and not room.is_available:
-                continue
-            if status_filter == "Заняты" and room.is_available:
-                continue
-            
-            # Фильтр по типу
-            if type_filter != "Все типы" and room.room_type != type_filter:
-                continue
-            
-            status = "✅ Доступен" if room.is_available else "❌ Занят"
-            price = f"{room.price_per_night:,.2f} руб.".replace(",", " ")
-            
-            self.tree.insert("", "end", values=(
-                room.id, hotel_name, room.room_number, room.room_type, price, status
-            ))
+    @staticmethod
+    def _set_options(combobox, all_label, options, counts, selected):
+        """Заполнение фильтра подписями «вариант — число номеров»; возвращает подпись → значение"""
+        labels = {f"{all_label} — {sum(counts.values())}": None}
+        for text, value in options:
+            labels[f"{text} — {counts.get(value, 0)}"] = value
+        combobox.configure(values=list(labels))
+        combobox.set(next((label for label, value in labels.items() if value == selected), next(iter(labels))))
+        return labels
+
+    def filter_criteria(self):
+        """Выбранные фильтры в виде поле → значение (None — любой)"""
+        _, hotel_id, is_available, room_type = self.current_filters()
+        return {"hotel_id": hotel_id, "is_available": is_available, "room_type": room_type}
+
+    def update_filter_options(self):
+        """Подписи фильтров с числом номеров для каждого варианта при остальных выбранных фильтрах"""
+        criteria = self.filter_criteria()
+        self._filter_counts = {field: self.room_vm.facet_counts(field, **criteria) for field in criteria}
+        self.update_hotel_options()
+
+    def update_hotel_options(self):
+        """Подписи отелей заново (после изменения отелей), числа номеров — прежние"""
+        self._hotel_texts = [(self.hotel_label(hotel.id), hotel.id) for hotel in self.hotel_vm.hotels]
+        self.render_filter_options()
+
+    def apply_filter_counts(self, event):
+        """Поправка чисел в фильтрах только по номерам из события: старые значения полей — минус, новые — плюс"""
+        if event.kind != ADDED and event.previous is None:
+            self.update_filter_options()
+            return
+        criteria = self.filter_criteria()
+        for room_id in event.ids:
+            changes = [] if event.kind == ADDED else [(event.previous.get(room_id), -1)]
+            if event.kind != REMOVED:
+                room = self.room_vm.get_room_by_id(room_id)
+                changes.append(({field: getattr(room, field) for field in criteria}, 1))
+            for values, delta in changes:
+                if values is None:
+                    continue
+                for field, counts in self._filter_counts.items():
+                    if all(value is None or values[name] == value
+                           for name, value in criteria.items() if name != field):
+                        counts[values[field]] = counts.get(values[field], 0) + delta
+        # В списке типов — все типы, что есть у номеров (как при полном пересчете), в том числе с нулем
+        type_counts = self._filter_counts["room_type"]
+        self._filter_counts["room_type"] = {room_type: type_counts.get(room_type, 0)
+                                            for room_type in self.room_vm.facet_counts("room_type")}
+        self.render_filter_options()
+
+    def render_filter_options(self):
+        """Заполнение фильтров по уже посчитанным числам"""
+        _, hotel_id, is_available, room_type = self.current_filters()
+        counts = self._filter_counts
+        self._hotel_options = self._set_options(
+            self.hotel_filter, "Все отели", self._hotel_texts, counts["hotel_id"], hotel_id)
+        self._status_options = self._set_options(
+            self.status_filter, "Все", [("Доступны", True), ("Заняты", False)],
+            counts["is_available"], is_available)
+        self._type_options = self._set_options(
+            self.type_filter, "Все типы", [(value, value) for value in sorted(counts["room_type"])],
+            counts["room_type"], room_type)
+
+    def hotel_label(self, hotel_id):
+        try:
+            hotel = self.hotel_vm.get_hotel_by_id(hotel_id)
+        except ValueError:
+            return "Неизвестно"
+        return f"{hotel.name} ({hotel.city})"
+
+    def hotel_text_matches(self, hotel_id, search_term):
+        """Содержат ли название или город отеля строку поиска"""
+        try:
+            hotel = self.hotel_vm.get_hotel_by_id(hotel_id)
+        except ValueError:
+            return False
+        return search_term in hotel.name.lower() or search_term in hotel.city.lower()
+
+    def current_filters(self):
+        """Текущие значения поиска и фильтров: строка, ID отеля, доступность, тип (None — любой)"""
+        return (self.search_entry.get().lower(), self._hotel_options.get(self.hotel_filter.get()),
+                self._status_options.get(self.status_filter.get()),
+                self._type_options.get(self.type_filter.get()))
+
+    def lookup_rooms(self, filters):
+        """Кандидаты из индексов: пересечение фасетов и результата текстового поиска"""
+        search_term, hotel_id, is_available, room_type = filters
+        ids = self.room_vm.filter_rooms(hotel_id, is_available, room_type)
+        if search_term:
+            found = self.room_vm.search_rooms(search_term, hotel_fields=("name", "city"))
+            ids = found if ids is None else found & ids
+        return ids
+
+    def room_matches(self, room, filters):
+        """Подходит ли номер под поиск и фильтры"""
+        search_term, hotel_id, is_available, room_type = filters
+        
+        # Поиск по номеру, типу, названию и городу отеля (те же поля, что в индексе)
+        if search_term and (search_term not in room.room_number.lower() and 
+                          search_term not in room.room_type.lower() and
+                          not self.hotel_text_matches(room.hotel_id, search_term)):
+            return False
+        
+        # Фильтры по отелю, статусу и типу
+        if hotel_id is not None and room.hotel_id != hotel_id:
+            return False
+        if is_available is not None and room.is_available != is_available:
+            return False
+        if room_type is not None and room.room_type != room_type:
+            return False
+        return True
+
+    def room_row_values(self, room):
+        """Значения строки таблицы"""
+        status = "✅ Доступен" if room.is_available else "❌ Занят"
+        price = f"{room.price_per_night:,.2f} руб.".replace(",", " ")
+        return (room.id, self.hotel_label(room.hotel_id), room.room_number, room.room_type, price, status)
+
+    def refresh_table(self, debounce: bool = False):
+        """Обновление таблицы; debounce — отложенный поиск при вводе"""
+        filters = self.current_filters()
+        self.search.search(filters, lambda room: self.room_matches(room, filters),
+                           delay=None if debounce else 0, narrow=debounce)
+
+    def on_rooms_changed(self, event):
+        """Построчное обновление таблицы и чисел в фильтрах после изменения номеров"""
+        if self.update_filter_options_changed(lambda: self.apply_filter_counts(event)):
+            return
+        filters = self.current_filters()
+        self.search.apply_change_event(event, lambda room: self.room_matches(room, filters))
+
+    def on_hotels_changed(self, event):
+        """Обновление фильтра отелей и строк номеров переименованных отелей"""
+        if self.update_filter_options_changed(self.update_hotel_options):
+            return
+        if event.kind == UPDATED:
+            filters = self.current_filters()
+            room_ids = [room.id for hotel_id in event.ids for room in self.room_vm.get_rooms_by_hotel(hotel_id)]
+            self.search.apply_change_event(ChangeEvent(UPDATED, room_ids),
+                                           lambda room: self.room_matches(room, filters))
+
+    def update_filter_options_changed(self, update):
+        """Обновление подписей фильтров через update; если выбранный вариант исчез, таблица строится заново"""
+        filters = self.current_filters()
+        update()
+        if self.current_filters() != filters:
+            # Выбор сменился — числа при новых фильтрах пересчитываются полностью
+            self.update_filter_options()
+            self.refresh_table()
+            return True
+        return False
 
     def get_selected_id(self):
         """Получить ID выбранного номера"""
-        selection = self.tree.selection()
-        return int(self.tree.item(selection[0])["values"][0]) if selection else None
+        return self.table.get_selected_id()
 
     def add_room(self):
         """Добавить номер"""
@@ -243,7 +385,6 @@ class CustomRoomWindow(ctk.CTkToplevel):
                     price_per_night=dialog.result["price_per_night"],
                     is_available=dialog.result["is_available"]
                 )
-                self.refresh_table()
             except ValueError as e:
                 messagebox.showerror("Ошибка", str(e))
 
@@ -276,7 +417,6 @@ class CustomRoomWindow(ctk.CTkToplevel):
                     price_per_night=dialog.result["price_per_night"],
                     is_available=dialog.result["is_available"]
                 )
-                self.refresh_table()
         except ValueError as e:
             messagebox.showerror("Ошибка", str(e))
 
@@ -290,22 +430,18 @@ class CustomRoomWindow(ctk.CTkToplevel):
         if messagebox.askyesno("Подтверждение", "Удалить выбранный номер?"):
             try:
                 self.room_vm.delete_room(room_id)
-                self.refresh_table()
             except ValueError as e:
                 messagebox.showerror("Ошибка", str(e))
 
     def show_stats(self):
         """Показать статистику по номерам"""
-        total_rooms = len(self.room_vm.rooms)
-        available_rooms = sum(1 for room in self.room_vm.rooms if room.is_available)
-        occupied_rooms = total_rooms - available_rooms
+        stats = self.room_vm.stats
+        total_rooms = stats.total
+        available_rooms = stats.available
+        occupied_rooms = stats.occupied
         
         # Статистика по типам номеров
-        type_stats = {}
-        for room in self.room_vm.rooms:
-            if room.room_type not in type_stats:
-                type_stats[room.room_type] = 0
-            type_stats[room.room_type] += 1
+        type_stats = dict(stats.by_type)
         
         # Создаем окно статистики
         stats_window = ctk.CTkToplevel(self)
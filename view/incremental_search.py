@@ -0,0 +1,107 @@
+from typing import Callable, Iterable, Optional, Tuple
+
+from view.virtual_table import VirtualTable
+from viewmodel.events import ChangeEvent
+
+
+class IncrementalSearch:
+    """Отложенная прерываемая фильтрация строк VirtualTable.
+
+    Запрос выполняется через delay мс после последнего ввода, порциями по
+    chunk_size записей в свободное время цикла событий Tk. Новый запрос
+    отменяет выполняющийся. Если поисковый текст лишь дополнил предыдущий
+    при тех же фильтрах, проверяются только строки прошлого результата.
+    Если задан lookup (ключ запроса → ID записей-кандидатов из индексов
+    или None, если индексы не сужают запрос), проверяются только кандидаты.
+
+    Ключ запроса — кортеж (поисковый текст, *остальные фильтры).
+    """
+
+    def __init__(self, widget, table: VirtualTable, items: Callable[[], Iterable], get_item: Callable,
+                 lookup: Optional[Callable[[Tuple], Optional[Iterable[int]]]] = None,
+                 delay: int = 250, chunk_size: int = 5000):
+        self.widget = widget
+        self.table = table
+        self.items = items
+        self.get_item = get_item
+        self.lookup = lookup
+        self.delay = delay
+        self.chunk_size = chunk_size
+        # Ключ результата, показанного в таблице
+        self._shown_key: Optional[Tuple] = None
+        self._key: Optional[Tuple] = None
+        self._matches: Optional[Callable] = None
+        self._timer = None
+        self._job = None
+
+    @property
+    def running(self) -> bool:
+        return self._job is not None
+
+    def search(self, key: Tuple, matches: Callable, delay: Optional[int] = None, narrow: bool = True):
+        """Запуск фильтрации; повторный вызов до истечения задержки переносит запуск.
+
+        narrow=False — проверить все записи, даже если ключ сужает прошлый запрос.
+        """
+        self.cancel()
+        self._key, self._matches = key, matches
+        delay = self.delay if delay is None else delay
+        self._timer = self.widget.after(delay, self._start, narrow)
+
+    def cancel(self):
+        """Отмена отложенного и выполняющегося запроса"""
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+            self._timer = None
+        self._job = None
+
+    def apply_change_event(self, event: ChangeEvent, matches: Callable):
+        """Применение изменения данных к показанным строкам.
+
+        Выполняющийся запрос уже мог пропустить измененные записи — он запускается заново по всем записям.
+        """
+        if self.running:
+            self._start(narrow=False)
+        else:
+            self.table.apply_change_event(event, self.get_item, matches)
+
+    @staticmethod
+    def _narrows(previous: Tuple, key: Tuple) -> bool:
+        """Результат key — подмножество результата previous"""
+        return previous[1:] == key[1:] and previous[0] in key[0]
+
+    def _start(self, narrow: bool = True):
+        self._timer = None
+        key = self._key
+        ids = self.lookup(key) if self.lookup is not None else None
+        if ids is not None:
+            candidates, by_id = sorted(ids), True
+        elif narrow and self._shown_key is not None and self._narrows(self._shown_key, key):
+            candidates, by_id = list(self.table.ids), True
+        else:
+            candidates, by_id = list(self.items()), False
+
+        job = self._job = object()
+        self._step(job, key, self._matches, candidates, by_id, 0, [])
+
+    def _step(self, job, key, matches, candidates, by_id, start, result):
+        if job is not self._job:
+            return
+        end = min(start + self.chunk_size, len(candidates))
+        for candidate in candidates[start:end]:
+            if by_id:
+                try:
+                    item = self.get_item(candidate)
+                except ValueError:
+                    continue
+            else:
+                item = candidate
+            if matches(item):
+                result.append(item.id)
+
+        if end < len(candidates):
+            self.widget.after_idle(self._step, job, key, matches, candidates, by_id, end, result)
+            return
+        self._job = None
+        self._shown_key = key
+        self.table.set_ids(result)
@@ -77,9 +77,9 @@ class MainWindow(tk.Tk):
             self.tree.delete(item)
 
         # Обновление статистики
-        total_hotels = len(self.hotel_vm.hotels)
-        total_rooms = len(self.room_vm.rooms)
-        available_rooms = sum(1 for room in self.room_vm.rooms if room.is_available)
+        total_hotels = self.hotel_vm.stats.total
+        total_rooms = self.room_vm.stats.total
+        available_rooms = self.room_vm.stats.available
         
         self.stats_label.config(
             text=f"Отелей: {total_hotels} | Номеров: {total_rooms} | Доступно номеров: {available_rooms}"
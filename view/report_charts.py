@@ -0,0 +1,198 @@
+import io
+import queue
+import threading
+from typing import Callable, Dict, Tuple
+
+from viewmodel.reports import HOTELS_REPORT, ROOMS_REPORT, PRICING_REPORT, ReportCache
+
+# Одновременно рисуется один график: отмененные задачи не конкурируют с актуальной
+_render_lock = threading.Lock()
+
+
+def render_report(report: str, data: Dict, dpi: int = 100) -> bytes:
+    """Отрисовка отчета в PNG через Agg, без Tk и pyplot — безопасно вне потока интерфейса"""
+    # matplotlib загружается при первом отчете, а не при старте приложения
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    if report == PRICING_REPORT:
+        fig = Figure(figsize=(12, 9), dpi=dpi)
+        _draw_pricing(fig.subplots(2, 2), data)
+    else:
+        fig = Figure(figsize=(12, 5), dpi=dpi)
+        ax1, ax2 = fig.subplots(1, 2)
+        if report == HOTELS_REPORT:
+            _draw_hotels(ax1, ax2, data)
+        elif report == ROOMS_REPORT:
+            _draw_rooms(ax1, ax2, data)
+        else:
+            raise ValueError(f"Неизвестный отчет: {report}")
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    FigureCanvasAgg(fig).print_png(buffer)
+    # Фигура не регистрируется в pyplot; очистка сразу освобождает оси и художников
+    fig.clear()
+    return buffer.getvalue()
+
+
+def _draw_hotels(ax1, ax2, data: Dict):
+    cities, stars = data["cities"], data["stars"]
+    # Диаграмма по городам
+    if cities:
+        ax1.pie(cities.values(), labels=cities.keys(), autopct='%1.1f%%', startangle=90)
+        ax1.set_title('Распределение отелей по городам')
+    # Диаграмма по звездам
+    if stars:
+        ax2.bar([f"{star}⭐" for star in stars], list(stars.values()),
+                color=['gold', 'silver', 'brown', 'lightblue', 'lightgreen'])
+        ax2.set_title('Распределение отелей по звездам')
+        ax2.set_ylabel('Количество отелей')
+
+
+def _draw_rooms(ax1, ax2, data: Dict):
+    types, availability = data["types"], data["availability"]
+    # Диаграмма по типам номеров
+    if types:
+        ax1.pie(types.values(), labels=types.keys(), autopct='%1.1f%%', startangle=90)
+        ax1.set_title('Распределение номеров по типам')
+    # Диаграмма по доступности
+    if any(availability.values()):
+        ax2.pie(availability.values(), labels=availability.keys(), autopct='%1.1f%%',
+                colors=['lightgreen', 'lightcoral'], startangle=90)
+        ax2.set_title('Доступность номеров')
+
+
+def _draw_pricing(axes, data: Dict):
+    (ax1, ax2), (ax3, ax4) = axes
+    by_type = data["by_type"]
+    if not by_type["labels"]:
+        return
+
+    # Мин. / средняя / макс. цена по типам номеров
+    types = by_type["labels"]
+    x = range(len(types))
+    width = 0.25
+    ax1.bar([i - width for i in x], by_type["min"], width, label='Мин. цена', color='lightgreen')
+    ax1.bar(x, by_type["avg"], width, label='Средняя цена', color='lightblue')
+    ax1.bar([i + width for i in x], by_type["max"], width, label='Макс. цена', color='lightcoral')
+    ax1.set_xlabel('Типы номеров')
+    ax1.set_ylabel('Цена (руб.)')
+    ax1.set_title('Анализ цен по типам номеров')
+    ax1.set_xticks(x)
+    ax1.set_xticklabels(types, rotation=45)
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    # Гистограмма цен
+    edges = data["histogram"]["edges"]
+    ax2.bar(edges[:-1], data["histogram"]["counts"], width=[b - a for a, b in zip(edges, edges[1:])],
+            align='edge', color='lightblue', edgecolor='steelblue')
+    ax2.set_xlabel('Цена (руб.)')
+    ax2.set_ylabel('Количество номеров')
+    ax2.set_title('Распределение цен')
+
+    # Средняя цена по городам: все номера и только доступные
+    by_city = data["by_city"]
+    x = range(len(by_city["labels"]))
+    width = 0.4
+    ax3.bar([i - width / 2 for i in x], by_city["avg"], width, label='Все номера', color='lightblue')
+    ax3.bar([i + width / 2 for i in x], by_city["available_avg"], width, label='Доступные', color='lightgreen')
+    ax3.set_title('Средняя цена по городам')
+    ax3.set_xticks(x)
+    ax3.set_xticklabels(by_city["labels"], rotation=45)
+    ax3.legend()
+    ax3.grid(True, alpha=0.3)
+
+    # Медиана и межквартильный размах по звездам отеля
+    by_stars = data["by_stars"]
+    labels = [f"{star}⭐" for star in by_stars["labels"]]
+    median = by_stars["percentiles"][50]
+    spread = [[m - low for m, low in zip(median, by_stars["percentiles"][25])],
+              [high - m for m, high in zip(median, by_stars["percentiles"][75])]]
+    ax4.bar(labels, median, yerr=spread, capsize=4, color='gold')
+    ax4.set_title('Медиана цены по звездам отеля (25–75%)')
+    ax4.grid(True, alpha=0.3)
+
+
+class ReportResult:
+    """Готовый отчет: вычисленные данные и изображение PNG"""
+
+    __slots__ = ("data", "image")
+
+    def __init__(self, data: Dict, image: bytes):
+        self.data = data
+        self.image = image
+
+
+class ReportRunner:
+    """Формирование отчетов в фоновом потоке.
+
+    Вычисление и отрисовка в PNG идут в рабочем потоке, поток Tk лишь
+    опрашивает очередь готовых результатов. Новый запуск отменяет
+    предыдущий: результат устаревшей задачи отбрасывается, а если она еще
+    не начала рисовать — не рисуется вовсе. Готовые результаты (данные и
+    PNG) сохраняются в cache по ключу (отчет, версии данных).
+    """
+
+    POLL_INTERVAL = 50
+
+    def __init__(self, widget, on_done: Callable[[str, bytes], None],
+                 on_error: Callable[[str, Exception], None], cache: ReportCache = None):
+        self.widget = widget
+        self.cache = cache
+        self.on_done = on_done
+        self.on_error = on_error
+        self._results = queue.Queue()
+        self._job = None
+        self._poll = None
+
+    @property
+    def running(self) -> bool:
+        return self._job is not None
+
+    def run(self, report: str, compute: Callable[[], Dict], key: Tuple = None):
+        """Запуск отчета; compute вычисляет данные отчета в рабочем потоке, key — ключ кэша"""
+        self.cancel()
+        job = self._job = object()
+        threading.Thread(target=self._work, args=(job, report, compute, key), name="report", daemon=True).start()
+        self._poll = self.widget.after(self.POLL_INTERVAL, self._check)
+
+    def cancel(self):
+        """Отмена выполняющегося отчета"""
+        self._job = None
+        if self._poll is not None:
+            self.widget.after_cancel(self._poll)
+            self._poll = None
+
+    def _work(self, job, report: str, compute: Callable[[], Dict], key: Tuple):
+        try:
+            data = compute()
+            with _render_lock:
+                if job is not self._job:
+                    return
+                image = render_report(report, data)
+        except Exception as e:
+            self._results.put((job, report, key, None, e))
+            return
+        self._results.put((job, report, key, ReportResult(data, image), None))
+
+    def _check(self):
+        self._poll = None
+        while True:
+            try:
+                job, report, key, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if job is not self._job:
+                continue
+            self._job = None
+            if error is not None:
+                self.on_error(report, error)
+                return
+            if self.cache is not None and key is not None:
+                self.cache.put(key, result)
+            self.on_done(report, result.image)
+            return
+        if self._job is not None:
+            self._poll = self.widget.after(self.POLL_INTERVAL, self._check)
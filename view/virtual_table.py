@@ -0,0 +1,246 @@
+from tkinter import ttk
+from typing import Any, Callable, Iterable, List, Optional
+
+from viewmodel.events import ChangeEvent, REMOVED
+
+
+class VirtualTable:
+    """Таблица с виртуальной прокруткой поверх ttk.Treeview.
+
+    Хранит только список ID строк отфильтрованного результата, а элементы
+    Treeview создает лишь для видимого окна строк. Полоса прокрутки
+    управляется вручную и отражает положение во всем результате.
+    Строки идентифицируются iid = str(ID записи).
+
+    После sort_by строки держатся упорядоченными по ключу: новый набор
+    сортируется целиком, а строки из событий изменения вставляются на место
+    бинарным поиском.
+    """
+
+    SCROLL_ROWS = 3
+
+    def __init__(self, parent, columns, row_values: Callable[[int], tuple], style: str = "Treeview", height: int = 16):
+        self.row_values = row_values
+        self.style = style
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings", style=style,
+                                 height=height, selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._on_scrollbar)
+
+        self._ids: List[int] = []
+        self._id_set = set()
+        self._offset = 0
+        self._visible_rows = height
+        self._selected_id: Optional[int] = None
+        self._sort_key: Optional[Callable[[int], Any]] = None
+        self._sort_reverse = False
+        self._sort_order: Optional[Callable[[List[int], bool], List[int]]] = None
+        self._sort_column = None
+        self._heading_texts = {}
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-self.SCROLL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(self.SCROLL_ROWS))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self._visible_rows))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self._visible_rows))
+
+    @property
+    def ids(self) -> List[int]:
+        """ID строк в порядке отображения"""
+        return self._ids
+
+    def heading(self, column, **kwargs):
+        return self.tree.heading(column, **kwargs)
+
+    def column(self, column, **kwargs):
+        return self.tree.column(column, **kwargs)
+
+    @property
+    def sorted(self) -> bool:
+        return self._sort_key is not None
+
+    def set_ids(self, ids: Iterable[int]):
+        """Замена всего набора строк"""
+        self._ids = self._sorted(ids)
+        self._id_set = set(self._ids)
+        self.render()
+
+    def sort_by(self, key: Optional[Callable[[int], Any]], reverse: bool = False,
+                order: Optional[Callable[[List[int], bool], List[int]]] = None):
+        """Сортировка строк по key(ID); key=None — отключить сортировку.
+
+        Ключ должен различать строки (например, включать ID). order(ids, reverse)
+        — более быстрая сортировка того же порядка, например по индексу viewmodel.
+        """
+        self._sort_key, self._sort_reverse, self._sort_order = key, reverse, order
+        self._ids = self._sorted(self._ids)
+        self.render()
+
+    def make_sortable(self, column, key: Callable[[int], Any],
+                      order: Optional[Callable[[List[int], bool], List[int]]] = None):
+        """Сортировка по щелчку на заголовке column: сначала по возрастанию, повторный щелчок — смена направления"""
+        self._heading_texts[column] = self.tree.heading(column, "text")
+        self.tree.heading(column, command=lambda: self._toggle_sort(column, key, order))
+
+    def _toggle_sort(self, column, key, order):
+        reverse = self._sort_column == column and not self._sort_reverse
+        if self._sort_column is not None:
+            self.tree.heading(self._sort_column, text=self._heading_texts[self._sort_column])
+        self._sort_column = column
+        self.tree.heading(column, text=f"{self._heading_texts[column]} {'▼' if reverse else '▲'}")
+        self.sort_by(key, reverse, order)
+
+    @property
+    def sort_column(self):
+        """Столбец, по которому отсортированы строки (None — без сортировки)"""
+        return self._sort_column if self.sorted else None
+
+    def resort(self):
+        """Повторная сортировка, если ключ изменился без событий по самим строкам"""
+        if self.sorted:
+            self.sort_by(self._sort_key, self._sort_reverse, self._sort_order)
+
+    def _sorted(self, ids: Iterable[int]) -> List[int]:
+        if self._sort_key is None:
+            return list(ids)
+        if self._sort_order is not None:
+            return self._sort_order(list(ids), self._sort_reverse)
+        return sorted(ids, key=self._sort_key, reverse=self._sort_reverse)
+
+    def _insert_sorted(self, item_id: int):
+        """Вставка строки на место по ключу сортировки"""
+        key = self._sort_key(item_id)
+        lo, hi = 0, len(self._ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = self._sort_key(self._ids[mid])
+            if (mid_key > key) if self._sort_reverse else (mid_key < key):
+                lo = mid + 1
+            else:
+                hi = mid
+        self._ids.insert(lo, item_id)
+
+    def apply_change_event(self, event: ChangeEvent, get_item: Callable, matches: Callable = lambda item: True):
+        """Применение события изменения к набору строк без повторной фильтрации всех записей.
+
+        Запись, переставшая подходить под фильтр, убирается, начавшая подходить — добавляется
+        в конец (при сортировке — на свое место). Измененная запись при сортировке переставляется.
+        """
+        to_remove = set()
+        to_place = []
+        for item_id in event.ids:
+            keep = False
+            if event.kind != REMOVED:
+                try:
+                    item = get_item(item_id)
+                except ValueError:
+                    item = None
+                keep = item is not None and matches(item)
+
+            if keep:
+                if item_id not in self._id_set:
+                    to_place.append(item_id)
+                elif self.sorted:
+                    to_remove.add(item_id)
+                    to_place.append(item_id)
+            elif item_id in self._id_set:
+                to_remove.add(item_id)
+
+        if to_remove:
+            self._ids = [item_id for item_id in self._ids if item_id not in to_remove]
+            self._id_set -= to_remove
+        for item_id in to_place:
+            if self.sorted:
+                self._insert_sorted(item_id)
+            else:
+                self._ids.append(item_id)
+            self._id_set.add(item_id)
+        self.render()
+
+    def get_selected_id(self) -> Optional[int]:
+        """ID выбранной строки, даже если она прокручена за пределы видимого окна"""
+        if self._selected_id is not None and self._selected_id not in self._id_set:
+            self._selected_id = None
+        return self._selected_id
+
+    def render(self):
+        """Перерисовка видимого окна строк и полосы прокрутки"""
+        total = len(self._ids)
+        self._offset = max(0, min(self._offset, total - self._visible_rows))
+
+        self.tree.delete(*self.tree.get_children())
+        visible = self._ids[self._offset:self._offset + self._visible_rows]
+        for item_id in visible:
+            self.tree.insert("", "end", iid=str(item_id), values=self.row_values(item_id))
+
+        if self._selected_id is not None and self.tree.exists(str(self._selected_id)):
+            self.tree.selection_set(str(self._selected_id))
+
+        if total:
+            self.scrollbar.set(self._offset / total, min(1.0, (self._offset + len(visible)) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, rows: int):
+        """Прокрутка на rows строк"""
+        self._offset += rows
+        self.render()
+
+    def scroll_to(self, item_id: int):
+        """Прокрутка так, чтобы строка с item_id стала видимой"""
+        if item_id not in self._id_set:
+            return
+        index = self._ids.index(item_id)
+        if index < self._offset:
+            self._offset = index
+        elif index >= self._offset + self._visible_rows:
+            self._offset = index - self._visible_rows + 1
+        self.render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        total = len(self._ids)
+        if action == "moveto":
+            self._offset = int(float(value) * total)
+        elif action == "scroll":
+            step = self._visible_rows if unit == "pages" else 1
+            self._offset += int(value) * step
+        self.render()
+
+    def _on_mousewheel(self, event):
+        self.scroll(-self.SCROLL_ROWS if event.delta > 0 else self.SCROLL_ROWS)
+        return "break"
+
+    def _on_select(self, event=None):
+        selection = self.tree.selection()
+        if selection:
+            self._selected_id = int(selection[0])
+        elif self._selected_id is not None and self.tree.exists(str(self._selected_id)):
+            # Снятие выделения с видимой строки; невидимая строка остается выбранной
+            self._selected_id = None
+
+    def _move_selection(self, delta: int):
+        if not self._ids:
+            return "break"
+        if self._selected_id in self._id_set:
+            index = self._ids.index(self._selected_id) + delta
+        else:
+            index = self._offset
+        index = max(0, min(index, len(self._ids) - 1))
+        self._selected_id = self._ids[index]
+        self.scroll_to(self._selected_id)
+        self.tree.focus(str(self._selected_id))
+        return "break"
+
+    def _on_configure(self, event):
+        """Пересчет числа видимых строк при изменении размера таблицы"""
+        rowheight = int(ttk.Style().lookup(self.style, "rowheight") or 20)
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else None
+        header = bbox[1] if bbox else rowheight
+        rows = max(1, (event.height - header) // rowheight)
+        if rows != self._visible_rows:
+            self._visible_rows = rows
+            self.render()
@@ -0,0 +1,55 @@
+from collections import Counter
+
+
+def _decrement(counter: Counter, key):
+    counter[key] -= 1
+    if counter[key] <= 0:
+        del counter[key]
+
+
+class HotelAggregates:
+    """Счетчики по отелям, обновляемые за O(1) при каждом изменении"""
+
+    def __init__(self):
+        self.total = 0
+        self.with_pool = 0
+        self.by_stars = Counter()
+        self.by_city = Counter()
+
+    def add(self, hotel):
+        self.total += 1
+        self.with_pool += hotel.has_pool
+        self.by_stars[hotel.stars] += 1
+        self.by_city[hotel.city] += 1
+
+    def remove(self, hotel):
+        self.total -= 1
+        self.with_pool -= hotel.has_pool
+        _decrement(self.by_stars, hotel.stars)
+        _decrement(self.by_city, hotel.city)
+
+
+class RoomAggregates:
+    """Счетчики по номерам, обновляемые за O(1) при каждом изменении"""
+
+    def __init__(self):
+        self.total = 0
+        self.available = 0
+        self.by_type = Counter()
+        self.by_hotel = Counter()
+
+    @property
+    def occupied(self) -> int:
+        return self.total - self.available
+
+    def add(self, room):
+        self.total += 1
+        self.available += room.is_available
+        self.by_type[room.room_type] += 1
+        self.by_hotel[room.hotel_id] += 1
+
+    def remove(self, room):
+        self.total -= 1
+        self.available -= room.is_available
+        _decrement(self.by_type, room.room_type)
+        _decrement(self.by_hotel, room.hotel_id)
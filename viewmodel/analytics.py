@@ -0,0 +1,159 @@
+from operator import attrgetter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Перцентили цен в сводках
+PERCENTILES = (25, 50, 75, 90)
+
+
+def _encode(items: Sequence, field: str, labels: Sequence = ()) -> Tuple[np.ndarray, List]:
+    """Коды значений поля (в порядке первого появления) и список значений по коду.
+
+    labels — уже выданные коды: их значения сохраняют свои номера.
+    """
+    codes = {label: code for code, label in enumerate(labels)}
+    array = np.fromiter((codes.setdefault(value, len(codes)) for value in map(attrgetter(field), items)),
+                        dtype=np.int64, count=len(items))
+    return array, list(codes)
+
+
+def _column(items: Sequence, field: str, dtype) -> np.ndarray:
+    return np.fromiter(map(attrgetter(field), items), dtype=dtype, count=len(items))
+
+
+def _hotel_columns(hotels: Sequence, hotel_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List]:
+    """Код города и звезды отеля для каждого номера (-1 — отеля нет в hotels) и список городов"""
+    city_codes, cities = _encode(hotels, "city")
+    stars = _column(hotels, "stars", np.int64)
+    ids = _column(hotels, "id", np.int64)
+    room_cities = np.full(len(hotel_ids), -1, dtype=np.int64)
+    room_stars = np.full(len(hotel_ids), -1, dtype=np.int64)
+    if len(hotels):
+        # Позиция отеля номера — бинарный поиск по отсортированным ID отелей
+        order = np.argsort(ids)
+        positions = np.minimum(np.searchsorted(ids[order], hotel_ids), len(hotels) - 1)
+        found = ids[order][positions] == hotel_ids
+        hotel_rows = order[positions[found]]
+        room_cities[found] = city_codes[hotel_rows]
+        room_stars[found] = stars[hotel_rows]
+    return room_cities, room_stars, cities
+
+
+class RoomAnalytics:
+    """Данные номеров в массивах NumPy и векторные сводки цен по ним.
+
+    Массивы строятся одним проходом по записям, дальше группировки по типу,
+    городу и звездам отеля считаются без циклов Python по номерам.
+    Номера отелей, которых нет в списке hotels, в сводки по городам и
+    звездам не попадают. После правок данных patched() обновляет массивы
+    по изменившимся номерам, не перечитывая остальные.
+    """
+
+    def __init__(self, rooms: Sequence, hotels: Sequence):
+        self.ids = _column(rooms, "id", np.int64)
+        self.prices = _column(rooms, "price_per_night", np.float64)
+        self.available = _column(rooms, "is_available", bool)
+        self.type_codes, self.types = _encode(rooms, "room_type")
+        self.hotel_ids = _column(rooms, "hotel_id", np.int64)
+        # Порядок номеров по возрастанию цены; общий для всех группировок
+        self._price_order = np.argsort(self.prices, kind="stable")
+        self.city_codes, self.stars, self.cities = _hotel_columns(hotels, self.hotel_ids)
+
+    def patched(self, changed: Dict[int, Optional[object]], hotels: Sequence,
+                hotels_changed: bool = True) -> "RoomAnalytics":
+        """Новые массивы с учетом изменений: changed — ID → номер или None для удаленного.
+
+        Из объектов Python читаются только изменившиеся номера: их прежние
+        строки отбрасываются, актуальные значения дописываются в конец.
+        Порядок по цене не сортируется заново, а сливается с новыми строками;
+        если отели не менялись (hotels_changed=False), их атрибуты ищутся
+        только для новых строк.
+        Текущий объект не меняется — им может пользоваться другой отчет.
+        """
+        rooms = [room for room in changed.values() if room is not None]
+        keep = ~np.isin(self.ids, np.fromiter(changed, dtype=np.int64, count=len(changed)))
+        result = RoomAnalytics.__new__(RoomAnalytics)
+        type_codes, result.types = _encode(rooms, "room_type", self.types)
+        result.type_codes = np.concatenate([self.type_codes[keep], type_codes])
+        for name, field, dtype in (("ids", "id", np.int64), ("prices", "price_per_night", np.float64),
+                                   ("available", "is_available", bool), ("hotel_ids", "hotel_id", np.int64)):
+            setattr(result, name, np.concatenate([getattr(self, name)[keep], _column(rooms, field, dtype)]))
+
+        # Оставшиеся строки сохраняют взаимный порядок, меняются только их позиции
+        kept_count = int(keep.sum())
+        positions = np.cumsum(keep) - 1
+        kept_order = positions[self._price_order[keep[self._price_order]]]
+        new_order = np.argsort(result.prices[kept_count:], kind="stable") + kept_count
+        # Новые строки стоят позже, поэтому при равной цене идут после оставшихся, как в устойчивой сортировке
+        insert_at = np.searchsorted(result.prices[kept_order], result.prices[new_order], side="right")
+        result._price_order = np.insert(kept_order, insert_at, new_order)
+        if hotels_changed:
+            result.city_codes, result.stars, result.cities = _hotel_columns(hotels, result.hotel_ids)
+        else:
+            city_codes, stars, result.cities = _hotel_columns(hotels, result.hotel_ids[kept_count:])
+            result.city_codes = np.concatenate([self.city_codes[keep], city_codes])
+            result.stars = np.concatenate([self.stars[keep], stars])
+        return result
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def grouped(self, codes: np.ndarray, labels: List) -> Dict:
+        """Сводка цен по группам: codes — номер группы каждого номера (-1 — вне групп).
+
+        Для каждой непустой группы: число номеров, минимум, среднее, максимум,
+        перцентили и средняя цена доступных номеров (NaN, если таких нет).
+        """
+        size = len(labels)
+        # Номера вне групп уходят в дополнительную группу size, она отбрасывается
+        codes = np.where(codes >= 0, codes, size)
+        counts = np.bincount(codes, minlength=size + 1)[:size]
+        sums = np.bincount(codes, weights=self.prices, minlength=size + 1)[:size]
+        available_counts = np.bincount(codes, weights=self.available, minlength=size + 1)[:size]
+        available_sums = np.bincount(codes, weights=self.prices * self.available, minlength=size + 1)[:size]
+
+        # Цены, упорядоченные по группе, внутри группы — по возрастанию: устойчивая
+        # сортировка кодов поверх общего порядка по цене (для малых кодов — поразрядная)
+        by_price = codes[self._price_order]
+        if size < np.iinfo(np.int16).max:
+            by_price = by_price.astype(np.int16)
+        sorted_prices = self.prices[self._price_order[np.argsort(by_price, kind="stable")]]
+        ends = np.cumsum(counts)
+        starts = ends - counts
+
+        present = counts > 0
+        counts, starts, ends = counts[present], starts[present], ends[present]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            available_mean = available_sums[present] / available_counts[present]
+        result = {
+            "labels": [label for label, keep in zip(labels, present) if keep],
+            "count": counts,
+            "min": sorted_prices[starts],
+            "mean": sums[present] / counts,
+            "max": sorted_prices[ends - 1],
+            "available_mean": available_mean,
+            "percentiles": {},
+        }
+        for q in PERCENTILES:
+            # Линейная интерполяция между соседними ценами, как в np.percentile
+            position = starts + (counts - 1) * (q / 100)
+            low = np.floor(position).astype(np.int64)
+            high = np.ceil(position).astype(np.int64)
+            fraction = position - low
+            result["percentiles"][q] = sorted_prices[low] + (sorted_prices[high] - sorted_prices[low]) * fraction
+        return result
+
+    def by_type(self) -> Dict:
+        return self.grouped(self.type_codes, self.types)
+
+    def by_city(self) -> Dict:
+        return self.grouped(self.city_codes, self.cities)
+
+    def by_stars(self) -> Dict:
+        labels = list(range(int(self.stars.max(initial=0)) + 1))
+        return self.grouped(self.stars, labels)
+
+    def histogram(self, bins: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """Число номеров по интервалам цен и границы интервалов"""
+        return np.histogram(self.prices, bins=bins)
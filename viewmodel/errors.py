@@ -0,0 +1,21 @@
+from typing import Dict
+
+
+class BatchError(ValueError):
+    """Ошибка пакетной операции: ни одна строка пакета не применена.
+
+    errors — {индекс строки: сообщение} для каждой отклоненной строки.
+    """
+
+    def __init__(self, errors: Dict[int, str]):
+        self.errors = errors
+        super().__init__(f"Пакет отклонен: ошибок в строках — {len(errors)}.")
+
+
+def row_error_message(error: Exception) -> str:
+    """Текст ошибки строки пакета"""
+    if isinstance(error, KeyError):
+        return f"Не указано поле {error.args[0]}."
+    if isinstance(error, ValueError):
+        return str(error)
+    return f"Некорректное значение: {error}"
@@ -0,0 +1,56 @@
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Виды изменений
+ADDED = "added"
+UPDATED = "updated"
+REMOVED = "removed"
+
+
+class ChangeEvent:
+    """Событие изменения данных: вид изменения и ID затронутых записей.
+
+    previous — значения фасетных полей записей до изменения (ID → поле →
+    значение) для UPDATED и REMOVED, если viewmodel их передает: подписчик
+    может поправить свои счетчики, не пересчитывая их заново.
+    """
+
+    __slots__ = ("kind", "ids", "previous")
+
+    def __init__(self, kind: str, ids: Iterable[int], previous: Optional[Dict[int, Dict[str, object]]] = None):
+        self.kind = kind
+        self.ids = list(ids)
+        self.previous = previous
+
+    def __repr__(self):
+        return f"ChangeEvent(kind='{self.kind}', ids={self.ids})"
+
+
+class Observable:
+    """Рассылка событий изменения данных нескольким подписчикам."""
+
+    def __init__(self):
+        self._listeners: List[Callable[[ChangeEvent], None]] = []
+        self._on_data_changed: Callable[[], None] = None
+
+    def subscribe(self, listener: Callable[[ChangeEvent], None]) -> Callable[[], None]:
+        """Подписка на события; возвращает функцию отписки"""
+        self._listeners.append(listener)
+        return lambda: self.unsubscribe(listener)
+
+    def unsubscribe(self, listener: Callable[[ChangeEvent], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def set_on_data_changed(self, callback: Callable[[], None]):
+        """Единственный обработчик без аргументов (для окон, перестраивающих таблицу целиком)"""
+        self._on_data_changed = callback
+
+    def _emit(self, kind: str, ids: Iterable[int], previous: Optional[Dict[int, Dict[str, object]]] = None):
+        event = ChangeEvent(kind, ids, previous)
+        if not event.ids:
+            return
+        # Копия списка: подписчик может отписаться прямо в обработчике
+        for listener in list(self._listeners):
+            listener(event)
+        if self._on_data_changed:
+            self._on_data_changed()
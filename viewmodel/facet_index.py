@@ -0,0 +1,60 @@
+from typing import Callable, Dict, Hashable, Iterable, Optional, Set
+
+
+class FacetIndex:
+    """Индекс фасетов: для каждого поля значение → множество ID записей.
+
+    Комбинация фильтров вычисляется пересечением множеств (от меньшего к
+    большему), а число записей для каждого значения поля — размером множества.
+    Возвращаемые множества принадлежат индексу и не должны изменяться.
+    keys — нормализация значений поля (например, город без учета регистра);
+    применяется и к значениям записей, и к значениям в запросах.
+    """
+
+    def __init__(self, fields: Iterable[str], keys: Dict[str, Callable[[object], Hashable]] = None):
+        self._sets: Dict[str, Dict[Hashable, Set[int]]] = {field: {} for field in fields}
+        self._keys = keys or {}
+
+    def _value(self, field: str, value) -> Hashable:
+        key = self._keys.get(field)
+        return value if key is None else key(value)
+
+    def add(self, item):
+        for field, sets in self._sets.items():
+            value = self._value(field, getattr(item, field))
+            ids = sets.get(value)
+            if ids is None:
+                ids = sets[value] = set()
+            ids.add(item.id)
+
+    def remove(self, item):
+        for field, sets in self._sets.items():
+            value = self._value(field, getattr(item, field))
+            ids = sets.get(value)
+            if ids is not None:
+                ids.discard(item.id)
+                if not ids:
+                    del sets[value]
+
+    def values(self, field: str) -> Iterable[Hashable]:
+        """Значения поля, встречающиеся хотя бы у одной записи"""
+        return self._sets[field].keys()
+
+    def ids(self, field: str, value: Hashable) -> Set[int]:
+        """ID записей с указанным значением поля"""
+        return self._sets[field].get(self._value(field, value), set())
+
+    def filter(self, criteria: Dict[str, Hashable]) -> Optional[Set[int]]:
+        """ID записей, подходящих под все условия поле → значение; None, если условий нет"""
+        if not criteria:
+            return None
+        sets = sorted((self.ids(field, value) for field, value in criteria.items()), key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def counts(self, field: str, criteria: Dict[str, Hashable] = None) -> Dict[Hashable, int]:
+        """Число записей для каждого значения поля с учетом условий по остальным полям"""
+        others = {name: value for name, value in (criteria or {}).items() if name != field}
+        base = self.filter(others)
+        if base is None:
+            return {value: len(ids) for value, ids in self._sets[field].items()}
+        return {value: len(ids & base) for value, ids in self._sets[field].items()}
@@ -1,30 +1,122 @@
-from typing import List, Callable
+from typing import Callable, Iterable, List, Dict, Optional, Set, Tuple
 from model.hotel import Hotel
 from service.json_service import JSONService
+from service.id_allocator import IdAllocator
+from viewmodel.aggregates import HotelAggregates
+from viewmodel.errors import BatchError, row_error_message
+from viewmodel.events import Observable, ADDED, UPDATED, REMOVED
+from viewmodel.facet_index import FacetIndex
+from viewmodel.search_index import SubstringIndex
+from viewmodel.sorted_index import SortOrders
 
-class HotelViewModel:
+# Поля отеля, по которым работает текстовый поиск
+SEARCH_FIELDS = ("name", "city", "address")
+# Поля отеля, по которым работают фильтры
+FACET_FIELDS = ("city", "stars", "has_pool")
+# Город в фильтре сравнивается так же, как в проверке уникальности: без пробелов по краям и регистра
+FACET_KEYS = {"city": lambda city: city.strip().lower()}
+# Ключи сортировки таблиц по полям отеля
+SORT_KEYS = {
+    "id": lambda hotel: hotel.id,
+    "name": lambda hotel: hotel.name.lower(),
+    "city": lambda hotel: hotel.city.lower(),
+    "address": lambda hotel: hotel.address.lower(),
+    "stars": lambda hotel: hotel.stars,
+    "has_pool": lambda hotel: hotel.has_pool,
+}
+
+class HotelViewModel(Observable):
     def __init__(self, json_service: JSONService):
+        super().__init__()
         self.json_service = json_service
         # Загрузка данных из JSON при инициализации
         self._hotels: List[Hotel] = self.json_service.load_data("hotels.json", Hotel)
-        self._on_data_changed: Callable[[], None] = None
+        # Индекс ID → отель для поиска за O(1)
+        self._hotels_by_id: Dict[int, Hotel] = {}
+        # Индекс (название, город) → ID для проверки уникальности за O(1)
+        self._name_city_index: Dict[Tuple[str, str], int] = {}
+        # Индексы триграмм для поиска подстроки по каждому полю; при загрузке строятся целиком
+        self._search_indexes: Dict[str, SubstringIndex] = {}
+        # Фасеты город / звезды / бассейн → множества ID отелей
+        self._facets = FacetIndex(FACET_FIELDS, FACET_KEYS)
+        # Счетчики для статистики, обновляемые при каждом изменении
+        self._stats = HotelAggregates()
+        # Версия данных: растет при каждом изменении записей (ключ кэшей производных данных)
+        self._data_version = 0
+        # Упорядоченные индексы по полям; строятся при первой сортировке
+        self._sort_orders = SortOrders(lambda: self._hotels, self.get_hotel_by_id, SORT_KEYS)
+        for hotel in self._hotels:
+            self._index_hotel(hotel)
+        self._search_indexes = {field: SubstringIndex.build(self._hotels, field) for field in SEARCH_FIELDS}
+        # Верхняя граница ID: хранится вместе с данными, досеивается один раз при загрузке
+        self._ids = IdAllocator(self.json_service.load_last_id("hotels.json"))
+        self._ids.seed(max((h.id for h in self._hotels), default=0))
+        self._room_vm = None
 
     @property
     def hotels(self) -> List[Hotel]:
         return self._hotels
 
-    def set_on_data_changed(self, callback: Callable[[], None]):
-        self._on_data_changed = callback
+    @property
+    def stats(self) -> HotelAggregates:
+        """Счетчики по отелям; только для чтения"""
+        return self._stats
 
-    def _notify(self):
-        if self._on_data_changed:
-            self._on_data_changed()
+    @property
+    def data_version(self) -> int:
+        """Монотонно растущая версия данных"""
+        return self._data_version
 
-    def _save_data(self):
-        """Сохранение данных в JSON файл"""
-        self.json_service.save_data("hotels.json", self._hotels)
+    def set_room_view_model(self, room_vm):
+        """Связь с RoomViewModel для проверки номеров при удалении отеля"""
+        self._room_vm = room_vm
 
-    def add_hotel(self, name: str, city: str, address: str, stars: int, has_pool: bool):
+    def reserve_ids(self, count: int) -> range:
+        """Резервирование блока ID для пакетной вставки"""
+        return self._ids.reserve(count)
+
+    def flush(self):
+        """Принудительная запись отложенных изменений"""
+        self.json_service.flush()
+
+    def _save_data(self, changed: List[Hotel] = (), deleted_ids: List[int] = ()):
+        """Сохранение изменившихся записей в хранилище"""
+        if changed:
+            self.json_service.save_items("hotels.json", changed, self._hotels)
+        if deleted_ids:
+            self.json_service.delete_items("hotels.json", deleted_ids, self._hotels)
+        self.json_service.save_last_id("hotels.json", self._ids.last_id)
+
+    @staticmethod
+    def _name_city_key(name: str, city: str) -> Tuple[str, str]:
+        return name.strip().lower(), city.strip().lower()
+
+    def _index_hotel(self, hotel: Hotel):
+        """Добавление отеля в индексы"""
+        self._hotels_by_id[hotel.id] = hotel
+        self._name_city_index[self._name_city_key(hotel.name, hotel.city)] = hotel.id
+        self._facets.add(hotel)
+        self._stats.add(hotel)
+        self._data_version += 1
+        self._sort_orders.add(hotel)
+        for field, index in self._search_indexes.items():
+            index.add(hotel.id, getattr(hotel, field))
+
+    def _unindex_hotel(self, hotel: Hotel):
+        """Удаление отеля из индексов"""
+        self._hotels_by_id.pop(hotel.id, None)
+        key = self._name_city_key(hotel.name, hotel.city)
+        if self._name_city_index.get(key) == hotel.id:
+            del self._name_city_index[key]
+        self._facets.remove(hotel)
+        self._stats.remove(hotel)
+        self._data_version += 1
+        self._sort_orders.remove(hotel)
+        for field, index in self._search_indexes.items():
+            index.remove(hotel.id, getattr(hotel, field))
+
+    @staticmethod
+    def _validate_fields(name: str, city: str, address: str, stars: int):
         if not name.strip():
             raise ValueError("Название отеля не может быть пустым.")
 
@@ -37,62 +129,174 @@ class HotelViewModel:
         if stars < 1 or stars > 5:
             raise ValueError("Количество звезд должно быть от 1 до 5.")
 
+    def add_hotel(self, name: str, city: str, address: str, stars: int, has_pool: bool):
+        self._validate_fields(name, city, address, stars)
+
         # Проверка на уникальность названия в городе
-        if any(h.name.lower() == name.strip().lower() and 
-               h.city.lower() == city.strip().lower() for h in self._hotels):
+        if self._name_city_key(name, city) in self._name_city_index:
             raise ValueError("Отель с таким названием в этом городе уже существует.")
 
         # Генерация нового ID
-        new_id = max((h.id for h in self._hotels), default=0) + 1
+        new_id = self._ids.next_id()
         new_hotel = Hotel(new_id, name.strip(), city.strip(), address.strip(), stars, has_pool)
         self._hotels.append(new_hotel)
-        self._save_data()
-        self._notify()
+        self._index_hotel(new_hotel)
+        self._save_data(changed=[new_hotel])
+        self._emit(ADDED, [new_id])
 
     def update_hotel(self, hotel_id: int, name: str, city: str, address: str, stars: int, has_pool: bool):
-        if not name.strip():
-            raise ValueError("Название отеля не может быть пустым.")
-
-        if not city.strip():
-            raise ValueError("Город не может быть пустым.")
-
-        if not address.strip():
-            raise ValueError("Адрес не может быть пустым.")
-
-        if stars < 1 or stars > 5:
-            raise ValueError("Количество звезд должно быть от 1 до 5.")
+        self._validate_fields(name, city, address, stars)
 
         # Проверка на уникальность названия в городе (исключая текущий отель)
-        if any(h.name.lower() == name.strip().lower() and 
-               h.city.lower() == city.strip().lower() and 
-               h.id != hotel_id for h in self._hotels):
+        owner_id = self._name_city_index.get(self._name_city_key(name, city))
+        if owner_id is not None and owner_id != hotel_id:
             raise ValueError("Отель с таким названием в этом городе уже существует.")
 
-        for hotel in self._hotels:
-            if hotel.id == hotel_id:
-                hotel.name = name.strip()
-                hotel.city = city.strip()
-                hotel.address = address.strip()
-                hotel.stars = stars
-                hotel.has_pool = has_pool
-                self._save_data()
-                self._notify()
-                return
-        raise ValueError(f"Отель с ID {hotel_id} не найден.")
+        hotel = self.get_hotel_by_id(hotel_id)
+        self._unindex_hotel(hotel)
+        hotel.name = name.strip()
+        hotel.city = city.strip()
+        hotel.address = address.strip()
+        hotel.stars = stars
+        hotel.has_pool = has_pool
+        self._index_hotel(hotel)
+        self._save_data(changed=[hotel])
+        self._emit(UPDATED, [hotel_id])
 
     def delete_hotel(self, hotel_id: int):
         # Проверяем, есть ли номера в этом отеле
-        from custom_main_hotel import room_vm
-        rooms_in_hotel = [room for room in room_vm.rooms if room.hotel_id == hotel_id]
-        if rooms_in_hotel:
+        if self._room_vm is not None and self._room_vm.count_rooms_in_hotel(hotel_id):
             raise ValueError("Нельзя удалить отель, в котором есть номера.")
 
-        self._hotels = [h for h in self._hotels if h.id != hotel_id]
-        self._save_data()
-        self._notify()
+        hotel = self._hotels_by_id.get(hotel_id)
+        if hotel is not None:
+            self._unindex_hotel(hotel)
+            self._hotels.remove(hotel)
+            self._save_data(deleted_ids=[hotel.id])
+            self._emit(REMOVED, [hotel_id])
+
+    def add_hotels(self, rows: List[dict]) -> List[Hotel]:
+        """Пакетное добавление отелей: все или ничего, одно сохранение и одно уведомление.
+
+        rows — словари с ключами name, city, address, stars, has_pool.
+        Если хотя бы одна строка некорректна, ничего не меняется и
+        выбрасывается BatchError с ошибкой для каждой строки.
+        """
+        errors: Dict[int, str] = {}
+        batch_keys = set()
+        for index, row in enumerate(rows):
+            try:
+                self._validate_fields(row["name"], row["city"], row["address"], row["stars"])
+                key = self._name_city_key(row["name"], row["city"])
+                if key in self._name_city_index or key in batch_keys:
+                    raise ValueError("Отель с таким названием в этом городе уже существует.")
+                batch_keys.add(key)
+            except Exception as e:
+                errors[index] = row_error_message(e)
+        if errors:
+            raise BatchError(errors)
+
+        new_hotels = [
+            Hotel(new_id, row["name"].strip(), row["city"].strip(), row["address"].strip(),
+                  row["stars"], row.get("has_pool", False))
+            for new_id, row in zip(self._ids.reserve(len(rows)), rows)
+        ]
+        self._hotels.extend(new_hotels)
+        for hotel in new_hotels:
+            self._index_hotel(hotel)
+        self._save_data(changed=new_hotels)
+        self._emit(ADDED, [hotel.id for hotel in new_hotels])
+        return new_hotels
+
+    def update_hotels(self, rows: List[dict]) -> List[Hotel]:
+        """Пакетное изменение отелей: все или ничего, одно сохранение и одно уведомление.
+
+        rows — словари с ключами hotel_id, name, city, address, stars, has_pool.
+        """
+        errors: Dict[int, str] = {}
+        updated_ids = set()
+        for row in rows:
+            if isinstance(row, dict) and "hotel_id" in row:
+                updated_ids.add(row["hotel_id"])
+
+        seen_ids = set()
+        batch_keys = set()
+        for index, row in enumerate(rows):
+            try:
+                hotel_id = row["hotel_id"]
+                if hotel_id in seen_ids:
+                    raise ValueError(f"Отель с ID {hotel_id} встречается в пакете повторно.")
+                seen_ids.add(hotel_id)
+                self.get_hotel_by_id(hotel_id)
+                self._validate_fields(row["name"], row["city"], row["address"], row["stars"])
+                # Ключи изменяемых отелей освобождаются, поэтому обмен названиями допустим
+                key = self._name_city_key(row["name"], row["city"])
+                owner_id = self._name_city_index.get(key)
+                if (owner_id is not None and owner_id not in updated_ids) or key in batch_keys:
+                    raise ValueError("Отель с таким названием в этом городе уже существует.")
+                batch_keys.add(key)
+            except Exception as e:
+                errors[index] = row_error_message(e)
+        if errors:
+            raise BatchError(errors)
+
+        hotels = [self._hotels_by_id[row["hotel_id"]] for row in rows]
+        for hotel in hotels:
+            self._unindex_hotel(hotel)
+        for hotel, row in zip(hotels, rows):
+            hotel.name = row["name"].strip()
+            hotel.city = row["city"].strip()
+            hotel.address = row["address"].strip()
+            hotel.stars = row["stars"]
+            hotel.has_pool = row.get("has_pool", hotel.has_pool)
+            self._index_hotel(hotel)
+        self._save_data(changed=hotels)
+        self._emit(UPDATED, [hotel.id for hotel in hotels])
+        return hotels
+
+    def delete_hotels(self, hotel_ids: List[int]):
+        """Пакетное удаление отелей: все или ничего, одно сохранение и одно уведомление"""
+        errors: Dict[int, str] = {}
+        for index, hotel_id in enumerate(hotel_ids):
+            if hotel_id not in self._hotels_by_id:
+                errors[index] = f"Отель с ID {hotel_id} не найден."
+            elif self._room_vm is not None and self._room_vm.count_rooms_in_hotel(hotel_id):
+                errors[index] = "Нельзя удалить отель, в котором есть номера."
+        if errors:
+            raise BatchError(errors)
+
+        ids = set(hotel_ids)
+        for hotel_id in ids:
+            self._unindex_hotel(self._hotels_by_id[hotel_id])
+        self._hotels[:] = [h for h in self._hotels if h.id not in ids]
+        self._save_data(deleted_ids=list(ids))
+        self._emit(REMOVED, ids)
 
     def get_hotel_by_id(self, hotel_id: int) -> Hotel:
-        for hotel in self._hotels:
-            if hotel.id == hotel_id:
-                return hotel
-        raise ValueError(f"Отель с ID {hotel_id} не найден.")
\ No newline at end of file
+        hotel = self._hotels_by_id.get(hotel_id)
+        if hotel is None:
+            raise ValueError(f"Отель с ID {hotel_id} не найден.")
+        return hotel
+
+    def has_hotel(self, hotel_id: int) -> bool:
+        return hotel_id in self._hotels_by_id
+
+    def search_hotels(self, term: str, fields: Tuple[str, ...] = SEARCH_FIELDS) -> Set[int]:
+        """ID отелей, у которых хотя бы одно из полей fields содержит term (без учета регистра)"""
+        result: Set[int] = set()
+        for field in fields:
+            result |= self._search_indexes[field].search(term)
+        return result
+    def filter_hotels(self, city: Optional[str] = None, stars: Optional[int] = None,
+                      has_pool: Optional[bool] = None) -> Optional[Set[int]]:
+        """ID отелей, подходящих под все заданные фильтры; None, если фильтры не заданы"""
+        criteria = {"city": city, "stars": stars, "has_pool": has_pool}
+        return self._facets.filter({field: value for field, value in criteria.items() if value is not None})
+
+    def sort_hotels(self, hotel_ids: Iterable[int], field: str, descending: bool = False) -> List[int]:
+        """ID отелей, упорядоченные по полю field (ключ из SORT_KEYS)"""
+        return self._sort_orders.order(hotel_ids, field, descending)
+
+    def hotel_sort_key(self, field: str) -> Callable[[int], Tuple]:
+        """Ключ сортировки по ID отеля, согласованный с sort_hotels"""
+        return self._sort_orders.sort_key(field)
@@ -0,0 +1,177 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from viewmodel.events import ChangeEvent, REMOVED
+
+# Виды отчетов
+HOTELS_REPORT = "hotels"
+ROOMS_REPORT = "rooms"
+PRICING_REPORT = "pricing"
+
+
+def report_version(report: str, hotel_vm, room_vm) -> Tuple[int, ...]:
+    """Версии данных, от которых зависит отчет"""
+    if report == HOTELS_REPORT:
+        return (hotel_vm.data_version,)
+    if report == ROOMS_REPORT:
+        return (room_vm.data_version,)
+    # Анализ цен группирует номера и по городу / звездам отеля
+    return (hotel_vm.data_version, room_vm.data_version)
+
+
+def take_snapshot(report: str, hotel_vm, room_vm, analytics: "AnalyticsCache" = None) -> Callable[[], Dict]:
+    """Снимок данных отчета в потоке интерфейса; возвращает вычисление для фонового потока.
+
+    Снимок дешевый: копии счетчиков или списков записей. Записи могут
+    измениться во время вычисления — отчет тогда лишь немного устареет.
+    analytics — кэш массивов NumPy для анализа цен между запусками.
+    """
+    if report == HOTELS_REPORT:
+        stats = hotel_vm.stats
+        cities, stars = dict(stats.by_city), dict(stats.by_stars)
+        return lambda: hotels_report(cities, stars)
+    if report == ROOMS_REPORT:
+        stats = room_vm.stats
+        types, available, occupied = dict(stats.by_type), stats.available, stats.occupied
+        return lambda: rooms_report(types, available, occupied)
+    if report == PRICING_REPORT:
+        rooms, hotels = list(room_vm.rooms), list(hotel_vm.hotels)
+        version = report_version(report, hotel_vm, room_vm)
+        if analytics is None:
+            base, changed = None, None
+        else:
+            base, changed = analytics.take_changes(room_vm, version)
+
+        def compute():
+            # NumPy загружается только при первом анализе цен
+            from viewmodel.analytics import RoomAnalytics
+            build = lambda: RoomAnalytics(rooms, hotels)
+            if analytics is None:
+                return pricing_report(build())
+            # Версии вида (отели, номера): атрибуты отелей пересчитываются, только если отели менялись
+            patch = lambda previous: previous.patched(changed, hotels, base[0] != version[0])
+            return pricing_report(analytics.get(version, build, base, patch, len(rooms)))
+        return compute
+    raise ValueError(f"Неизвестный отчет: {report}")
+
+
+def hotels_report(cities: Dict[str, int], stars: Dict[int, int]) -> Dict:
+    """Распределение отелей по городам и звездам"""
+    return {"cities": cities, "stars": {star: stars[star] for star in sorted(stars)}}
+
+
+def rooms_report(types: Dict[str, int], available: int, occupied: int) -> Dict:
+    """Распределение номеров по типам и доступности"""
+    return {"types": types, "availability": {"Доступно": available, "Занято": occupied}}
+
+
+def _group_report(group: Dict) -> Dict:
+    return {
+        "labels": group["labels"],
+        "count": group["count"].tolist(),
+        "min": group["min"].tolist(),
+        "avg": group["mean"].tolist(),
+        "max": group["max"].tolist(),
+        "available_avg": group["available_mean"].tolist(),
+        "percentiles": {q: values.tolist() for q, values in group["percentiles"].items()},
+    }
+
+
+def pricing_report(analytics) -> Dict:
+    """Анализ цен: сводки по типам номеров, городам и звездам отелей, гистограмма цен"""
+    counts, edges = analytics.histogram()
+    return {
+        "by_type": _group_report(analytics.by_type()),
+        "by_city": _group_report(analytics.by_city()),
+        "by_stars": _group_report(analytics.by_stars()),
+        "histogram": {"counts": counts.tolist(), "edges": edges.tolist()},
+    }
+
+
+class AnalyticsCache:
+    """Массивы аналитики последней версии данных.
+
+    Кэш подписывается на события номеров и запоминает изменившиеся номера,
+    поэтому после правок массивы обновляются по ним (patch), а полностью
+    пересобираются (build) только при первом расчете или если цепочка
+    версий прервалась.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._analytics = None
+        # Изменения номеров с прошлого снимка; ведутся в потоке интерфейса
+        self._changed: Dict[int, object] = {}
+        self._tracked_version = None
+        self._room_vm = None
+        self._unsubscribe = None
+
+    def _on_rooms_changed(self, event: ChangeEvent):
+        for room_id in event.ids:
+            self._changed[room_id] = None if event.kind == REMOVED else self._room_vm.get_room_by_id(room_id)
+
+    def take_changes(self, room_vm, version: Hashable) -> Tuple[Optional[Hashable], Dict[int, object]]:
+        """Версия прошлого снимка и номера, изменившиеся с тех пор (ID → номер или None для удаленного).
+
+        Вызывается в потоке интерфейса при снимке отчета.
+        """
+        if room_vm is not self._room_vm:
+            if self._unsubscribe is not None:
+                self._unsubscribe()
+            self._room_vm = room_vm
+            self._unsubscribe = room_vm.subscribe(self._on_rooms_changed)
+            self._changed, self._tracked_version = {}, None
+        base, changed = self._tracked_version, self._changed
+        self._changed, self._tracked_version = {}, version
+        return base, changed
+
+    def get(self, version: Hashable, build: Callable[[], object], base: Hashable = None,
+            patch: Callable[[object], object] = None, size: int = None):
+        """Массивы версии version: из кэша, обновлением версии base через patch или построением заново.
+
+        size — ожидаемое число номеров; если обновленные массивы с ним не
+        сходятся (изменение прошло мимо событий), они строятся заново.
+        """
+        # Блокировка: параллельные задачи одной версии строят массивы один раз
+        with self._lock:
+            if self._analytics is None or self._version != version:
+                analytics = None
+                if patch is not None and self._analytics is not None and self._version == base:
+                    analytics = patch(self._analytics)
+                    if size is not None and len(analytics) != size:
+                        analytics = None
+                self._analytics = analytics if analytics is not None else build()
+                self._version = version
+            return self._analytics
+
+
+class ReportCache:
+    """Ограниченный LRU-кэш готовых отчетов: (отчет, версии данных) → результат.
+
+    Версии только растут, поэтому при сохранении новой версии отчета прежние
+    версии того же отчета удаляются сразу, не дожидаясь вытеснения.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable], object]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[str, Hashable]) -> Optional[object]:
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: Tuple[str, Hashable], result):
+        report = key[0]
+        for stale in [old for old in self._entries if old[0] == report and old != key]:
+            del self._entries[stale]
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
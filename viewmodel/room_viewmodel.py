@@ -1,31 +1,119 @@
-from typing import List, Callable
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 from model.room import Room
 from service.json_service import JSONService
+from service.id_allocator import IdAllocator
+from viewmodel.aggregates import RoomAggregates
+from viewmodel.errors import BatchError, row_error_message
+from viewmodel.events import Observable, ADDED, UPDATED, REMOVED
+from viewmodel.facet_index import FacetIndex
+from viewmodel.search_index import SubstringIndex
+from viewmodel.sorted_index import SortOrders
 
-class RoomViewModel:
+# Поля номера, по которым работает текстовый поиск
+SEARCH_FIELDS = ("room_number", "room_type")
+# Поля номера, по которым работают фильтры
+FACET_FIELDS = ("hotel_id", "is_available", "room_type")
+# Ключи сортировки таблиц по полям номера; "hotel" — название отеля
+SORT_KEYS = {
+    "id": lambda room: room.id,
+    "room_number": lambda room: room.room_number.lower(),
+    "room_type": lambda room: room.room_type,
+    "price_per_night": lambda room: room.price_per_night,
+    "is_available": lambda room: room.is_available,
+}
+
+class RoomViewModel(Observable):
     def __init__(self, hotel_vm, json_service: JSONService):
         self.hotel_vm = hotel_vm
+        super().__init__()
         self.json_service = json_service
         # Загрузка данных из JSON при инициализации
         self._rooms: List[Room] = self.json_service.load_data("rooms.json", Room)
-        self._on_data_changed: Callable[[], None] = None
+        # Индекс ID → номер для поиска за O(1)
+        self._rooms_by_id: Dict[int, Room] = {}
+        # Индекс (ID отеля, номер комнаты) → ID для проверки уникальности за O(1)
+        self._room_number_index: Dict[Tuple[int, str], int] = {}
+        # Фасеты ID отеля / доступность / тип → множества ID номеров; размер множества — число номеров
+        self._facets = FacetIndex(FACET_FIELDS)
+        # Счетчики для статистики, обновляемые при каждом изменении
+        self._stats = RoomAggregates()
+        # Версия данных: растет при каждом изменении записей (ключ кэшей производных данных)
+        self._data_version = 0
+        # Упорядоченные индексы по полям (в т.ч. по цене); строятся при первом запросе
+        sort_keys = dict(SORT_KEYS, hotel=self._hotel_sort_key)
+        self._sort_orders = SortOrders(lambda: self._rooms, self.get_room_by_id, sort_keys)
+        # Индексы триграмм для поиска подстроки по каждому полю; при загрузке строятся целиком
+        self._search_indexes: Dict[str, SubstringIndex] = {}
+        for room in self._rooms:
+            self._index_room(room)
+        self._search_indexes = {field: SubstringIndex.build(self._rooms, field) for field in SEARCH_FIELDS}
+        # Верхняя граница ID: хранится вместе с данными, досеивается один раз при загрузке
+        self._ids = IdAllocator(self.json_service.load_last_id("rooms.json"))
+        self._ids.seed(max((r.id for r in self._rooms), default=0))
+        self.hotel_vm.set_room_view_model(self)
+        self.hotel_vm.subscribe(self._on_hotels_changed)
 
     @property
     def rooms(self) -> List[Room]:
         return self._rooms
 
-    def set_on_data_changed(self, callback: Callable[[], None]):
-        self._on_data_changed = callback
+    @property
+    def stats(self) -> RoomAggregates:
+        """Счетчики по номерам; только для чтения"""
+        return self._stats
 
-    def _notify(self):
-        if self._on_data_changed:
-            self._on_data_changed()
+    @property
+    def data_version(self) -> int:
+        """Монотонно растущая версия данных"""
+        return self._data_version
 
-    def _save_data(self):
-        """Сохранение данных в JSON файл"""
-        self.json_service.save_data("rooms.json", self._rooms)
+    def reserve_ids(self, count: int) -> range:
+        """Резервирование блока ID для пакетной вставки"""
+        return self._ids.reserve(count)
 
-    def add_room(self, hotel_id: int, room_number: str, room_type: str, price_per_night: float, is_available: bool = True):
+    def flush(self):
+        """Принудительная запись отложенных изменений"""
+        self.json_service.flush()
+
+    def _save_data(self, changed: List[Room] = (), deleted_ids: List[int] = ()):
+        """Сохранение изменившихся записей в хранилище"""
+        if changed:
+            self.json_service.save_items("rooms.json", changed, self._rooms)
+        if deleted_ids:
+            self.json_service.delete_items("rooms.json", deleted_ids, self._rooms)
+        self.json_service.save_last_id("rooms.json", self._ids.last_id)
+
+    @staticmethod
+    def _facet_values(room: Room) -> Dict[str, object]:
+        """Значения фасетных полей номера (для событий об изменении)"""
+        return {field: getattr(room, field) for field in FACET_FIELDS}
+
+    def _index_room(self, room: Room):
+        """Добавление номера в индексы"""
+        self._rooms_by_id[room.id] = room
+        self._room_number_index[(room.hotel_id, room.room_number)] = room.id
+        self._facets.add(room)
+        self._stats.add(room)
+        self._data_version += 1
+        self._sort_orders.add(room)
+        for field, index in self._search_indexes.items():
+            index.add(room.id, getattr(room, field))
+
+    def _unindex_room(self, room: Room):
+        """Удаление номера из индексов"""
+        self._rooms_by_id.pop(room.id, None)
+        key = (room.hotel_id, room.room_number)
+        if self._room_number_index.get(key) == room.id:
+            del self._room_number_index[key]
+        self._facets.remove(room)
+        self._stats.remove(room)
+        self._data_version += 1
+        self._sort_orders.remove(room)
+        for field, index in self._search_indexes.items():
+            index.remove(room.id, getattr(room, field))
+
+    def _validate_fields(self, hotel_id: int, room_number: str, room_type: str, price_per_night: float):
         if not room_number.strip():
             raise ValueError("Номер комнаты не может быть пустым.")
 
@@ -36,62 +124,256 @@ class RoomViewModel:
             raise ValueError("Цена за ночь должна быть положительной.")
 
         # Проверяем существование отеля
-        hotel_exists = any(h.id == hotel_id for h in self.hotel_vm.hotels)
-        if not hotel_exists:
+        if not self.hotel_vm.has_hotel(hotel_id):
             raise ValueError("Указанный отель не существует.")
 
+    def add_room(self, hotel_id: int, room_number: str, room_type: str, price_per_night: float, is_available: bool = True):
+        self._validate_fields(hotel_id, room_number, room_type, price_per_night)
+
         # Проверка на уникальность номера комнаты в отеле
-        if any(r.room_number == room_number.strip() and 
-               r.hotel_id == hotel_id for r in self._rooms):
+        if (hotel_id, room_number.strip()) in self._room_number_index:
             raise ValueError("Номер с таким названием уже существует в этом отеле.")
 
         # Генерация нового ID
-        new_id = max((r.id for r in self._rooms), default=0) + 1
+        new_id = self._ids.next_id()
         new_room = Room(new_id, hotel_id, room_number.strip(), room_type.strip(), price_per_night, is_available)
         self._rooms.append(new_room)
-        self._save_data()
-        self._notify()
+        self._index_room(new_room)
+        self._save_data(changed=[new_room])
+        self._emit(ADDED, [new_id])
 
     def update_room(self, room_id: int, hotel_id: int, room_number: str, room_type: str, price_per_night: float, is_available: bool):
-        if not room_number.strip():
-            raise ValueError("Номер комнаты не может быть пустым.")
-
-        if not room_type.strip():
-            raise ValueError("Тип номера не может быть пустым.")
-
-        if price_per_night <= 0:
-            raise ValueError("Цена за ночь должна быть положительной.")
-
-        # Проверяем существование отеля
-        hotel_exists = any(h.id == hotel_id for h in self.hotel_vm.hotels)
-        if not hotel_exists:
-            raise ValueError("Указанный отель не существует.")
+        self._validate_fields(hotel_id, room_number, room_type, price_per_night)
 
         # Проверка на уникальность номера комнаты в отеле (исключая текущий номер)
-        if any(r.room_number == room_number.strip() and 
-               r.hotel_id == hotel_id and 
-               r.id != room_id for r in self._rooms):
+        owner_id = self._room_number_index.get((hotel_id, room_number.strip()))
+        if owner_id is not None and owner_id != room_id:
             raise ValueError("Номер с таким названием уже существует в этом отеле.")
 
-        for room in self._rooms:
-            if room.id == room_id:
-                room.hotel_id = hotel_id
-                room.room_number = room_number.strip()
-                room.room_type = room_type.strip()
-                room.price_per_night = price_per_night
-                room.is_available = is_available
-                self._save_data()
-                self._notify()
-                return
-        raise ValueError(f"Номер с ID {room_id} не найден.")
+        room = self.get_room_by_id(room_id)
+        previous = {room_id: self._facet_values(room)}
+        self._unindex_room(room)
+        room.hotel_id = hotel_id
+        room.room_number = room_number.strip()
+        # Как и в Room.__init__: одна копия строки на тип номера
+        room.room_type = sys.intern(room_type.strip())
+        room.price_per_night = price_per_night
+        room.is_available = is_available
+        self._index_room(room)
+        self._save_data(changed=[room])
+        self._emit(UPDATED, [room_id], previous)
 
     def delete_room(self, room_id: int):
-        self._rooms = [r for r in self._rooms if r.id != room_id]
-        self._save_data()
-        self._notify()
+        room = self._rooms_by_id.get(room_id)
+        if room is not None:
+            self._unindex_room(room)
+            self._rooms.remove(room)
+            self._save_data(deleted_ids=[room.id])
+            self._emit(REMOVED, [room_id], {room_id: self._facet_values(room)})
+
+    def add_rooms(self, rows: List[dict]) -> List[Room]:
+        """Пакетное добавление номеров: все или ничего, одно сохранение и одно уведомление.
+
+        rows — словари с ключами hotel_id, room_number, room_type,
+        price_per_night, is_available. Если хотя бы одна строка некорректна,
+        ничего не меняется и выбрасывается BatchError с ошибкой для каждой строки.
+        """
+        errors: Dict[int, str] = {}
+        batch_keys = set()
+        for index, row in enumerate(rows):
+            try:
+                self._validate_fields(row["hotel_id"], row["room_number"], row["room_type"], row["price_per_night"])
+                key = (row["hotel_id"], row["room_number"].strip())
+                if key in self._room_number_index or key in batch_keys:
+                    raise ValueError("Номер с таким названием уже существует в этом отеле.")
+                batch_keys.add(key)
+            except Exception as e:
+                errors[index] = row_error_message(e)
+        if errors:
+            raise BatchError(errors)
+
+        new_rooms = [
+            Room(new_id, row["hotel_id"], row["room_number"].strip(), row["room_type"].strip(),
+                 row["price_per_night"], row.get("is_available", True))
+            for new_id, row in zip(self._ids.reserve(len(rows)), rows)
+        ]
+        self._rooms.extend(new_rooms)
+        for room in new_rooms:
+            self._index_room(room)
+        self._save_data(changed=new_rooms)
+        self._emit(ADDED, [room.id for room in new_rooms])
+        return new_rooms
+
+    def update_rooms(self, rows: List[dict]) -> List[Room]:
+        """Пакетное изменение номеров: все или ничего, одно сохранение и одно уведомление.
+
+        rows — словари с ключами room_id, hotel_id, room_number, room_type,
+        price_per_night, is_available.
+        """
+        errors: Dict[int, str] = {}
+        updated_ids = set()
+        for row in rows:
+            if isinstance(row, dict) and "room_id" in row:
+                updated_ids.add(row["room_id"])
+
+        seen_ids = set()
+        batch_keys = set()
+        for index, row in enumerate(rows):
+            try:
+                room_id = row["room_id"]
+                if room_id in seen_ids:
+                    raise ValueError(f"Номер с ID {room_id} встречается в пакете повторно.")
+                seen_ids.add(room_id)
+                self.get_room_by_id(room_id)
+                self._validate_fields(row["hotel_id"], row["room_number"], row["room_type"], row["price_per_night"])
+                # Ключи изменяемых номеров освобождаются, поэтому обмен номерами допустим
+                key = (row["hotel_id"], row["room_number"].strip())
+                owner_id = self._room_number_index.get(key)
+                if (owner_id is not None and owner_id not in updated_ids) or key in batch_keys:
+                    raise ValueError("Номер с таким названием уже существует в этом отеле.")
+                batch_keys.add(key)
+            except Exception as e:
+                errors[index] = row_error_message(e)
+        if errors:
+            raise BatchError(errors)
+
+        rooms = [self._rooms_by_id[row["room_id"]] for row in rows]
+        previous = {room.id: self._facet_values(room) for room in rooms}
+        for room in rooms:
+            self._unindex_room(room)
+        for room, row in zip(rooms, rows):
+            room.hotel_id = row["hotel_id"]
+            room.room_number = row["room_number"].strip()
+            room.room_type = sys.intern(row["room_type"].strip())
+            room.price_per_night = row["price_per_night"]
+            room.is_available = row.get("is_available", room.is_available)
+            self._index_room(room)
+        self._save_data(changed=rooms)
+        self._emit(UPDATED, [room.id for room in rooms], previous)
+        return rooms
+
+    def delete_rooms(self, room_ids: List[int]):
+        """Пакетное удаление номеров: все или ничего, одно сохранение и одно уведомление"""
+        errors = {index: f"Номер с ID {room_id} не найден."
+                  for index, room_id in enumerate(room_ids) if room_id not in self._rooms_by_id}
+        if errors:
+            raise BatchError(errors)
+
+        ids = set(room_ids)
+        previous = {room_id: self._facet_values(self._rooms_by_id[room_id]) for room_id in ids}
+        for room_id in ids:
+            self._unindex_room(self._rooms_by_id[room_id])
+        self._rooms[:] = [r for r in self._rooms if r.id not in ids]
+        self._save_data(deleted_ids=list(ids))
+        self._emit(REMOVED, ids, previous)
 
     def get_room_by_id(self, room_id: int) -> Room:
-        for room in self._rooms:
-            if room.id == room_id:
-                return room
-        raise ValueError(f"Номер с ID {room_id} не найден.")
\ No newline at end of file
+        room = self._rooms_by_id.get(room_id)
+        if room is None:
+            raise ValueError(f"Номер с ID {room_id} не найден.")
+        return room
+
+    def get_rooms_by_hotel(self, hotel_id: int) -> List[Room]:
+        return [self._rooms_by_id[room_id] for room_id in self._facets.ids("hotel_id", hotel_id)]
+
+    def count_rooms_in_hotel(self, hotel_id: int) -> int:
+        return len(self._facets.ids("hotel_id", hotel_id))
+
+    def search_rooms(self, term: str, fields: Tuple[str, ...] = SEARCH_FIELDS,
+                     hotel_fields: Tuple[str, ...] = ("name",)) -> Set[int]:
+        """ID номеров, у которых поле fields или поле hotel_fields их отеля содержит term"""
+        result: Set[int] = set()
+        for field in fields:
+            result |= self._search_indexes[field].search(term)
+        if hotel_fields:
+            for hotel_id in self.hotel_vm.search_hotels(term, hotel_fields):
+                result |= self._facets.ids("hotel_id", hotel_id)
+        return result
+
+    @staticmethod
+    def _facet_criteria(hotel_id: Optional[int], is_available: Optional[bool],
+                        room_type: Optional[str]) -> Dict[str, object]:
+        criteria = {"hotel_id": hotel_id, "is_available": is_available, "room_type": room_type}
+        return {field: value for field, value in criteria.items() if value is not None}
+
+    def filter_rooms(self, hotel_id: Optional[int] = None, is_available: Optional[bool] = None,
+                     room_type: Optional[str] = None) -> Optional[Set[int]]:
+        """ID номеров, подходящих под все заданные фильтры; None, если фильтры не заданы"""
+        return self._facets.filter(self._facet_criteria(hotel_id, is_available, room_type))
+
+    def facet_counts(self, field: str, hotel_id: Optional[int] = None, is_available: Optional[bool] = None,
+                     room_type: Optional[str] = None) -> Dict[object, int]:
+        """Число номеров для каждого значения поля field с учетом фильтров по остальным полям"""
+        return self._facets.counts(field, self._facet_criteria(hotel_id, is_available, room_type))
+
+    def _hotel_sort_key(self, room: Room) -> str:
+        try:
+            return self.hotel_vm.get_hotel_by_id(room.hotel_id).name.lower()
+        except ValueError:
+            return ""
+
+    def _on_hotels_changed(self, event):
+        # Порядок по названию отеля устаревает при переименовании отеля
+        if event.kind == UPDATED:
+            self._sort_orders.invalidate("hotel")
+
+    def sort_rooms(self, room_ids: Iterable[int], field: str, descending: bool = False) -> List[int]:
+        """ID номеров, упорядоченные по полю field (ключ из SORT_KEYS или "hotel")"""
+        return self._sort_orders.order(room_ids, field, descending)
+
+    def room_sort_key(self, field: str) -> Callable[[int], Tuple]:
+        """Ключ сортировки по ID номера, согласованный с sort_rooms"""
+        return self._sort_orders.sort_key(field)
+
+    def find_rooms(self, min_price: Optional[float] = None, max_price: Optional[float] = None,
+                   hotel_id: Optional[int] = None, city: Optional[str] = None,
+                   is_available: Optional[bool] = None, room_type: Optional[str] = None,
+                   limit: Optional[int] = None, descending: bool = False) -> List[Room]:
+        """Номера с ценой в [min_price, max_price] под заданными фильтрами, от дешевых к дорогим.
+
+        descending — от дорогих к дешевым, limit — вернуть только первые limit номеров.
+        """
+        if limit == 0:
+            return []
+        city_hotels = self.hotel_vm.filter_hotels(city=city) if city is not None else None
+
+        def matches(room: Room) -> bool:
+            return ((hotel_id is None or room.hotel_id == hotel_id) and
+                    (is_available is None or room.is_available == is_available) and
+                    (room_type is None or room.room_type == room_type) and
+                    (city_hotels is None or room.hotel_id in city_hotels) and
+                    (min_price is None or room.price_per_night >= min_price) and
+                    (max_price is None or room.price_per_night <= max_price))
+
+        # Самый узкий из фильтров — источник кандидатов, если он уже диапазона цен
+        sources = [(len(ids), ids) for ids in (self._facets.ids(field, value) for field, value
+                   in self._facet_criteria(hotel_id, is_available, room_type).items())]
+        if city_hotels is not None:
+            sources.append((sum(self.count_rooms_in_hotel(city_hotel_id) for city_hotel_id in city_hotels), None))
+        size, smallest = min(sources, key=lambda source: source[0], default=(None, None))
+
+        prices = self._sort_orders.index("price_per_night")
+        if size is not None and size < prices.count(min_price, max_price):
+            if smallest is None:
+                smallest = [room_id for city_hotel_id in city_hotels
+                            for room_id in self._facets.ids("hotel_id", city_hotel_id)]
+            rooms = [room for room in map(self._rooms_by_id.__getitem__, smallest) if matches(room)]
+            rooms.sort(key=lambda room: (room.price_per_night, room.id), reverse=descending)
+            return rooms[:limit]
+
+        if limit is None:
+            # Весь диапазон: сначала дешевая проверка по множеству самого узкого фильтра
+            room_ids = prices.range_ids(min_price, max_price, reverse=descending)
+            if smallest is not None:
+                room_ids = [room_id for room_id in room_ids if room_id in smallest]
+            return [room for room in map(self._rooms_by_id.__getitem__, room_ids) if matches(room)]
+
+        # Иначе идем по ценовому индексу и останавливаемся, набрав limit номеров
+        result = []
+        for room_id in prices.iter_range(min_price, max_price, reverse=descending):
+            room = self._rooms_by_id[room_id]
+            if matches(room):
+                result.append(room)
+                if len(result) >= limit:
+                    break
+        return result
@@ -0,0 +1,98 @@
+from typing import Dict, Iterable, List, Set
+
+GRAM_SIZE = 3
+
+
+def normalize(value: str) -> str:
+    """Приведение строки к виду, в котором она хранится в индексе"""
+    return value.lower()
+
+
+def _grams(value: str) -> Set[str]:
+    return {value[i:i + GRAM_SIZE] for i in range(len(value) - GRAM_SIZE + 1)}
+
+
+class SubstringIndex:
+    """Инвертированный индекс триграмм для поиска подстроки без учета регистра.
+
+    Индекс хранит различные нормализованные значения поля: значение → ID
+    записей и триграмма → значения, в которых она встречается. Запрос от
+    трех символов пересекает множества значений своих триграмм и проверяет
+    только оставшиеся; более короткий запрос проверяет все различные
+    значения, которых обычно намного меньше, чем записей.
+    """
+
+    def __init__(self):
+        self._ids_by_value: Dict[str, Set[int]] = {}
+        self._values_by_gram: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        """Число различных значений"""
+        return len(self._ids_by_value)
+
+    @classmethod
+    def build(cls, items: Iterable, field: str) -> "SubstringIndex":
+        """Построение индекса по полю field всех записей сразу.
+
+        Записи группируются по исходному значению, поэтому нормализация и
+        разбиение на триграммы выполняются один раз на различное значение.
+        """
+        ids_by_raw: Dict[str, List[int]] = {}
+        for item in items:
+            value = getattr(item, field)
+            ids = ids_by_raw.get(value)
+            if ids is None:
+                ids_by_raw[value] = [item.id]
+            else:
+                ids.append(item.id)
+
+        index = cls()
+        for value, ids in ids_by_raw.items():
+            index.add(ids[0], value)
+            index._ids_by_value[normalize(value)].update(ids)
+        return index
+
+    def add(self, item_id: int, value: str):
+        value = normalize(value)
+        ids = self._ids_by_value.get(value)
+        if ids is None:
+            ids = self._ids_by_value[value] = set()
+            for gram in _grams(value):
+                self._values_by_gram.setdefault(gram, set()).add(value)
+        ids.add(item_id)
+
+    def remove(self, item_id: int, value: str):
+        value = normalize(value)
+        ids = self._ids_by_value.get(value)
+        if ids is None:
+            return
+        ids.discard(item_id)
+        if ids:
+            return
+        del self._ids_by_value[value]
+        for gram in _grams(value):
+            values = self._values_by_gram.get(gram)
+            if values is not None:
+                values.discard(value)
+                if not values:
+                    del self._values_by_gram[gram]
+
+    def matching_values(self, query: str) -> Iterable[str]:
+        """Различные значения, содержащие query"""
+        query = normalize(query)
+        if len(query) < GRAM_SIZE:
+            return [value for value in self._ids_by_value if query in value]
+
+        candidates = sorted((self._values_by_gram.get(gram, ()) for gram in _grams(query)), key=len)
+        if not candidates[0]:
+            return []
+        values = set(candidates[0]).intersection(*candidates[1:])
+        # Совпадение всех триграмм не гарантирует их порядок — проверяем подстроку
+        return [value for value in values if query in value]
+
+    def search(self, query: str) -> Set[int]:
+        """ID записей, значение которых содержит query"""
+        result: Set[int] = set()
+        for value in self.matching_values(query):
+            result.update(self._ids_by_value[value])
+        return result
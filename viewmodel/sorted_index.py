@@ -0,0 +1,117 @@
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class SortedIndex:
+    """Упорядоченный индекс: ID записей, отсортированные по ключу (при равных ключах — по ID).
+
+    Ключи и ID хранятся в двух параллельных списках, позиция ищется
+    бинарным поиском. Поддерживает выборку диапазона ключей в прямом и
+    обратном порядке и упорядочивание произвольного набора ID.
+    """
+
+    def __init__(self, items: Iterable, key: Callable):
+        self.key = key
+        pairs = sorted((key(item), item.id) for item in items)
+        self._keys: List = [k for k, _ in pairs]
+        self._ids: List[int] = [item_id for _, item_id in pairs]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _position(self, key, item_id: int) -> int:
+        lo = bisect_left(self._keys, key)
+        hi = bisect_right(self._keys, key, lo)
+        return bisect_left(self._ids, item_id, lo, hi)
+
+    def add(self, item):
+        key = self.key(item)
+        pos = self._position(key, item.id)
+        self._keys.insert(pos, key)
+        self._ids.insert(pos, item.id)
+
+    def remove(self, item):
+        key = self.key(item)
+        pos = self._position(key, item.id)
+        if pos < len(self._ids) and self._ids[pos] == item.id and self._keys[pos] == key:
+            del self._keys[pos]
+            del self._ids[pos]
+
+    def _bounds(self, low, high):
+        start = 0 if low is None else bisect_left(self._keys, low)
+        end = len(self._keys) if high is None else bisect_right(self._keys, high)
+        return start, max(start, end)
+
+    def count(self, low=None, high=None) -> int:
+        """Число записей с ключом в [low, high]"""
+        start, end = self._bounds(low, high)
+        return end - start
+
+    def iter_range(self, low=None, high=None, reverse: bool = False) -> Iterator[int]:
+        """ID записей с ключом в [low, high] по возрастанию (reverse — по убыванию) ключа"""
+        start, end = self._bounds(low, high)
+        if reverse:
+            return (self._ids[i] for i in range(end - 1, start - 1, -1))
+        return (self._ids[i] for i in range(start, end))
+
+    def range_ids(self, low=None, high=None, reverse: bool = False) -> List[int]:
+        """Список ID записей с ключом в [low, high] (срез индекса)"""
+        start, end = self._bounds(low, high)
+        ids = self._ids[start:end]
+        return ids[::-1] if reverse else ids
+
+    def order(self, ids: Optional[Set[int]] = None, reverse: bool = False) -> List[int]:
+        """ID из набора ids (все, если None) в порядке индекса"""
+        ordered = self._ids if ids is None else [item_id for item_id in self._ids if item_id in ids]
+        return ordered[::-1] if reverse else list(ordered)
+
+
+class SortOrders:
+    """Кэш упорядоченных индексов по полям для сортировки таблиц.
+
+    Индекс поля строится при первой сортировке по нему и дальше
+    поддерживается при каждом изменении записей, поэтому повторная
+    сортировка не сортирует записи заново.
+    """
+
+    # Набор меньше 1/SMALL_FRACTION всех записей быстрее отсортировать напрямую
+    SMALL_FRACTION = 8
+
+    def __init__(self, items: Callable[[], List], get_item: Callable[[int], object],
+                 keys: Dict[str, Callable]):
+        self._items = items
+        self._get_item = get_item
+        self._keys = keys
+        self._indexes: Dict[str, SortedIndex] = {}
+
+    def add(self, item):
+        for index in self._indexes.values():
+            index.add(item)
+
+    def remove(self, item):
+        for index in self._indexes.values():
+            index.remove(item)
+
+    def invalidate(self, field: str):
+        """Сброс индекса поля, ключ которого изменился вне записей (например, производный)"""
+        self._indexes.pop(field, None)
+
+    def index(self, field: str) -> SortedIndex:
+        index = self._indexes.get(field)
+        if index is None:
+            index = self._indexes[field] = SortedIndex(self._items(), self._keys[field])
+        return index
+
+    def sort_key(self, field: str) -> Callable[[int], Tuple]:
+        """Ключ сортировки по ID записи в том же порядке, что и индекс"""
+        key = self._keys[field]
+        return lambda item_id: (key(self._get_item(item_id)), item_id)
+
+    def order(self, ids: Iterable[int], field: str, reverse: bool = False) -> List[int]:
+        """ID из ids, упорядоченные по полю field"""
+        ids = set(ids)
+        total = len(self._items())
+        if len(ids) * self.SMALL_FRACTION < total:
+            return sorted(ids, key=self.sort_key(field), reverse=reverse)
+        # Набор из всех записей не нужно фильтровать
+        return self.index(field).order(None if len(ids) == total else ids, reverse=reverse)